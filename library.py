@@ -20,25 +20,82 @@
 실행 방법:
   - 대화식 모드: `python library.py`
   - 자가 테스트: `python library.py --mode selftest`
+  - 저널 모드: `python library.py --journal` (변경분만 journal.log에 기록)
+  - SQLite 저장: `python library.py --storage sqlite` (data/library.db, 변경 행만 기록, 대출·반납 조회는 SQLite 인덱스. 데이터는 메모리에 모두 로드)
+  - 여러 단말 공유: 모든 단말을 `python library.py --shared` 로 실행 (같은 data 디렉터리)
+  - 자가 테스트를 파일에 저장: `python library.py --mode selftest --storage json` (data/_selftest)
+  - CSV/Parquet 초기 도서목록: `python library.py --catalog books.parquet` (열: 제목, 저자, 등록일, 책개수)
+  - 카탈로그 일괄 가져오기: `python library.py --mode import a.xlsx b.csv ...` (여러 파일을 병렬로 읽음)
+  - 시작 시간 측정: `python library.py --timing`
+  - 벤치마크: `python library.py --mode bench [--bench startup] [--bench-size N]`
   
 사전 준비:
   - YES24 크롤러 실행: `python yes24_crawler.py` (yes24_bestsellers.xlsx 생성)
 """
 
 from __future__ import annotations
+import abc
 import argparse
+import contextlib
+import csv
+import functools
+import hashlib
+import importlib.util
+import io
 import json
 import os
+import pickle
+import re
+import sqlite3
+import struct
 import sys
-import pandas as pd
-from dataclasses import dataclass, asdict
+import tempfile
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, asdict, fields
+from operator import attrgetter
 from datetime import date, timedelta
+from itertools import starmap
 from typing import List, Optional
 
+_MODULE_STARTED = time.perf_counter()  # --timing: /proc가 없을 때 임포트 시간의 기준
+
+# pandas는 선택 의존성이며 가져오는 데만 수백 ms가 걸리므로, 엑셀을 데이터프레임으로 읽을 때 _pandas()로 로드
+pd = None
+
+try:
+    import orjson  # 선택 의존성: 설치되어 있으면 compact 모드 인코더로 사용
+except ImportError:
+    orjson = None
+
+try:
+    import fcntl  # POSIX 전용: 여러 프로세스가 데이터 디렉터리를 공유할 때 잠금에 사용
+except ImportError:
+    fcntl = None
+
 # -------------------- 경로/설정 --------------------
 DEFAULT_DATA_DIR = "data"
 EXCEL_FILE = "yes24_bestsellers.xlsx"
+EXCEL_COLUMNS = ('제목', '저자', '등록일', '책개수')
+EXCEL_OPTIONAL_COLUMNS = ('책개수',)  # 없으면 도서마다 복본 1개
+EXCEL_IMPORTERS = ("pandas", "stream")  # pandas: 데이터프레임(+캐시), stream: openpyxl read_only로 한 행씩
+EXCEL_CACHE_SUFFIX = ".cache.pkl"  # 엑셀 옆에 파싱 결과를 내용 해시와 함께 보관 (openpyxl 파싱 생략)
 DUE_DAYS = 14
+JOURNAL_FILE = "journal.log"
+JOURNAL_CHECKPOINT_EVERY = 1000  # 저널 레코드가 이 수에 도달하면 JSON으로 체크포인트
+GROUP_COMMIT_MS = 0  # 0보다 크면 이 시간(ms) 안에 들어온 변경을 한 번에 기록 (그룹 커밋)
+WRITE_RETRY_LIMIT = 5  # 기록 스레드가 연속으로 실패하면 재시도를 멈추고 flush()/close()에서 오류를 알림
+WRITE_RETRY_DELAY_S = 0.1  # 기록 실패 후 재시도 간격 (실패할 때마다 두 배)
+SNAPSHOT_FILE = "snapshot.bin"
+SNAPSHOT_MAGIC = b"KULIBSNP"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct(">8sHQ")  # 매직, 포맷 버전, 본문 길이
+SETTINGS_FILE = "settings.json"  # 데이터 디렉터리별 저장 설정 (json_format 등)
+JSON_FORMATS = ("pretty", "compact")  # pretty: indent=2, compact: 공백 없음(+orjson)
+ARCHIVE_DIR = "archive"  # 반납 후 오래된 대출을 월별 세그먼트(loans-YYYY-MM.json)로 보관
+LOCK_FILE = ".lock"  # 공유 모드: 읽기-수정-쓰기 동안 잡는 데이터 디렉터리 잠금 파일
+VERSIONS_DOC = "versions"  # 공유 모드: 컬렉션별 버전 번호 (커밋할 때마다 증가)
 
 # -------------------- 유틸 --------------------
 
@@ -53,14 +110,284 @@ def _read_json(path: str, default):
         try:
             return json.load(f)
         except json.JSONDecodeError:
-            # 수동 편집 방지: 파싱 에러 시 빈 구조로 초기화
-            return default
+            pass
+    # 수동 편집 방지: 파싱 에러 시 빈 구조로 초기화하되, 다음 저장이 덮어쓰기 전에 원본을 보관
+    backup = path + ".corrupt"
+    os.replace(path, backup)
+    print(f"경고: {path} 파일을 읽을 수 없어 {backup} 으로 옮기고 빈 데이터로 시작합니다.")
+    return default
+
+
+_JSON_WS = re.compile(r"[ \t\r\n]*")
+_JSON_SEP = re.compile(r"[ \t\r\n]*([,\]])[ \t\r\n]*")
+
+
+def _iter_json_array(path: str, chunk_size: int = 1 << 16):
+    """최상위 JSON 배열의 원소를 파일 전체를 메모리에 올리지 않고 하나씩 반환합니다.
+
+    형식이 잘못되었으면 json.JSONDecodeError를 발생시킵니다.
+    """
+    if not os.path.exists(path):
+        return
+    decode = json.JSONDecoder().raw_decode
+    with open(path, "r", encoding="utf-8") as f:
+        buf, pos = "", 0
+
+        def read_more() -> bool:
+            nonlocal buf, pos
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return False
+            buf, pos = buf[pos:] + chunk, 0
+            return True
+
+        def next_char() -> str:
+            nonlocal pos
+            while True:
+                pos = _JSON_WS.match(buf, pos).end()
+                if pos < len(buf):
+                    return buf[pos]
+                if not read_more():
+                    raise json.JSONDecodeError("배열이 끝나기 전에 파일이 끝났습니다", buf, pos)
+
+        if next_char() != "[":
+            raise json.JSONDecodeError("JSON 배열이 아닙니다", buf, pos)
+        pos += 1
+        if next_char() == "]":
+            return
+        while True:
+            next_char()
+            try:
+                obj, end = decode(buf, pos)
+            except json.JSONDecodeError:
+                # 원소가 조각 경계에 걸친 경우 이어서 읽고 다시 시도 (비정상적으로 큰 원소는 손상으로 간주)
+                if len(buf) - pos > 64 * chunk_size or not read_more():
+                    raise
+                continue
+            yield obj
+            pos = end
+            while True:
+                m = _JSON_SEP.match(buf, pos)
+                if m:
+                    break
+                if _JSON_WS.match(buf, pos).end() < len(buf):
+                    raise json.JSONDecodeError("',' 또는 ']'가 필요합니다", buf, pos)
+                if not read_more():
+                    raise json.JSONDecodeError("배열이 끝나기 전에 파일이 끝났습니다", buf, pos)
+            if m.group(1) == "]":
+                return
+            pos = m.end()
+
+
+def _dump_json(data, compact: bool = False) -> bytes:
+    if not compact:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _fsync_dir(path: str):
+    """rename 결과가 디스크에 남도록 디렉터리 항목을 동기화합니다 (POSIX 전용)."""
+    if os.name != "posix":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextlib.contextmanager
+def _flock(path: str):
+    """path 파일에 배타적 권고 잠금을 잡습니다 (다른 프로세스가 잡고 있으면 대기).
 
+    POSIX 전용이며 fcntl이 없으면 잠그지 않습니다. 그래서 공유 모드는 fcntl이 없으면 시작하지 않습니다.
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(path, "a") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _write_bytes(path: str, payload: bytes) -> int:
+    """임시 파일에 기록·fsync 후 rename 하여, 중단되어도 이전 내용이나 새 내용 중 하나만 남깁니다."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _fsync_dir(directory)
+    return len(payload)
+
+
+def _write_json(path: str, data, compact: bool = False) -> int:
+    """JSON 파일을 저장하고 기록한 바이트 수를 반환합니다."""
+    return _write_bytes(path, _dump_json(data, compact))
+
+
+def _rows(items) -> List[dict]:
+    """데이터 클래스 목록을 직렬화용 dict 목록으로 바꿉니다.
+
+    모든 필드가 스칼라이므로 asdict()의 재귀 복사 없이 인스턴스 __dict__를 그대로 씁니다.
+    """
+    return [vars(o) for o in items]
+
+
+def _pandas():
+    """pandas를 처음 필요할 때 가져옵니다. 설치되어 있지 않으면 ImportError가 발생합니다."""
+    global pd
+    if pd is None:
+        import pandas
+        pd = pandas
+    return pd
+
+
+def _has_pandas() -> bool:
+    """pandas를 가져오지 않고 설치 여부만 확인합니다."""
+    return pd is not None or importlib.util.find_spec("pandas") is not None
+
+
+def _iter_workbook_rows(path: str, columns):
+    """엑셀 첫 시트를 read_only 모드로 한 행씩 읽어 columns 순서의 값 튜플을 반환합니다 (없는 열은 None)."""
+    import openpyxl  # pandas 없이도 쓸 수 있도록 필요할 때만 로드
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        index = _column_index(next(rows, ()), columns)
+        for row in rows:
+            yield tuple(row[i] if i is not None and i < len(row) else None for i in index)
+    finally:
+        wb.close()
+
+
+def _iter_csv_rows(path: str, columns):
+    """CSV 카탈로그(UTF-8, BOM 허용)를 한 행씩 읽어 columns 순서의 값 튜플을 반환합니다 (빈 칸은 None)."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        rows = csv.reader(f)
+        index = _column_index(next(rows, ()), columns)
+        for row in rows:
+            yield tuple((row[i] or None) if i is not None and i < len(row) else None for i in index)
+
+
+def _column_index(header, columns) -> List[int]:
+    """머리글 행에서 columns 각 열의 위치를 찾습니다 (선택 열이 없으면 None). 필수 열이 없으면 KeyError가 발생합니다."""
+    header = list(header)
+    index = [header.index(c) if c in header else None for c in columns]
+    missing = [c for c, i in zip(columns, index) if i is None and c not in EXCEL_OPTIONAL_COLUMNS]
+    if missing:
+        raise KeyError(", ".join(missing))
+    return index
+
+
+def _iter_parquet_rows(path: str, columns):
+    """Parquet 카탈로그를 레코드 배치 단위로 읽어 columns 순서의 값 튜플을 반환합니다 (pyarrow 필요)."""
+    import pyarrow.parquet as pq  # Parquet 카탈로그를 쓸 때만 로드
+    f = pq.ParquetFile(path)
+    try:
+        index = _column_index(f.schema_arrow.names, columns)
+        present = [c for c, i in zip(columns, index) if i is not None]
+        for batch in f.iter_batches(columns=present):
+            values = dict(zip(present, (batch.column(i).to_pylist() for i in range(len(present)))))
+            missing = [None] * batch.num_rows
+            yield from zip(*(values.get(c, missing) for c in columns))
+    finally:
+        f.close()
 
-def _write_json(path: str, data):
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+
+CATALOG_READERS = {".xlsx": _iter_workbook_rows, ".xlsm": _iter_workbook_rows, ".csv": _iter_csv_rows,
+                   ".parquet": _iter_parquet_rows}
+
+
+def _iter_catalog_rows(path: str, columns=EXCEL_COLUMNS):
+    """확장자에 맞는 읽기 함수로 카탈로그 파일의 행을 읽습니다."""
+    ext = os.path.splitext(path)[1].lower()
+    reader = CATALOG_READERS.get(ext)
+    if reader is None:
+        raise ValueError(f"지원하지 않는 카탈로그 형식입니다 ({ext or '확장자 없음'})")
+    return reader(path, columns)
+
+
+def _catalog_from_rows(rows):
+    """(제목, 저자, 등록일, 책개수) 행을 도서 목록(행 순서대로 work_id 1..n)과 행별 복본 수로 바꿉니다.
+
+    네 열이 모두 빈 행은 pandas 경로(_read_catalog_frame)와 같이 건너뜁니다.
+    """
+    works, counts = [], []
+    for title, author, registered, count in rows:
+        if title is None and author is None and registered is None and count is None:
+            continue
+        author = _cell_str(author)
+        works.append(Work(len(works) + 1, _cell_str(title), norm_author_key(author), author,
+                          _cell_str(registered)))
+        counts.append(_copy_count(count))
+    return works, counts
+
+
+def _parse_catalog_file(path: str):
+    """카탈로그 파일 하나를 읽습니다. 프로세스 풀에서 실행되므로 모듈 최상위에 둡니다."""
+    try:
+        return _catalog_from_rows(_iter_catalog_rows(path))
+    except Exception as e:
+        raise ValueError(f"{path}: {e}") from e
+
+
+def read_catalogs(paths: List[str], workers: Optional[int] = None):
+    """여러 카탈로그 파일을 프로세스 풀에서 나눠 읽고 (제목, 저자키)가 같은 행을 합칩니다.
+
+    파일은 주어진 순서대로 합치므로 결과는 워커 수와 관계없이 같습니다. 같은 도서가 여러 번
+    나오면 처음 나온 행의 정보를 쓰고 책개수는 가장 큰 값을 씁니다.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    if workers <= 1:
+        results = map(_parse_catalog_file, paths)
+    else:
+        from concurrent.futures import ProcessPoolExecutor  # 여러 파일을 병렬로 읽을 때만 필요 (시작 시간 단축)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_parse_catalog_file, paths))
+    position = {}
+    works, counts = [], []
+    for file_works, file_counts in results:
+        for work, count in zip(file_works, file_counts):
+            key = (work.title, work.author_key)
+            i = position.get(key)
+            if i is None:
+                position[key] = len(works)
+                work.work_id = len(works) + 1
+                works.append(work)
+                counts.append(count)
+            elif count > counts[i]:
+                counts[i] = count
+    return works, counts
+
+
+def _cell_str(value) -> str:
+    """엑셀 셀 값을 pandas 경로와 같은 문자열로 바꿉니다 (빈 셀은 'nan')."""
+    return "nan" if value is None else str(value)
+
+
+def _copy_count(value) -> int:
+    """책개수 셀 값을 복본 수로 바꿉니다. 없거나 숫자가 아니면 1, 소수는 버림, 음수면 0."""
+    try:
+        n = float(value)
+    except (TypeError, ValueError):
+        return 1
+    if n != n or n in (float("inf"), float("-inf")):
+        return 1
+    return max(int(n), 0)
 
 
 def norm_author_key(author: str) -> str:
@@ -112,106 +439,897 @@ class Loan:
     due_date: str
     return_date: Optional[str] = None
 
-# -------------------- 저장소 --------------------
+# 컬렉션 이름 -> (데이터 클래스, 기본키 필드)
+COLLECTIONS = {
+    "works": (Work, "work_id"),
+    "copies": (Copy, "copy_id"),
+    "members": (Member, "student_id"),
+    "loans": (Loan, "loan_id"),
+    "deleted_works": (Work, "work_id"),
+}
 
-class Repository:
-    def __init__(self, data_dir: str = DEFAULT_DATA_DIR):
+# -------------------- 저장 백엔드 --------------------
+
+class Storage(abc.ABC):
+    """Repository가 사용하는 저장 백엔드 인터페이스.
+
+    컬렉션은 이름으로 구분하며 load/save는 컬렉션 전체를, append는 변경
+    레코드({"op": "put"|"del", "c": 컬렉션, ...})를 다룹니다. 이름에 '/'가
+    들어간 보조 컬렉션(예: archive/loans-2025-01)과 작은 dict 문서도 저장합니다.
+    추상 메서드를 모두 구현하지 않은 백엔드는 생성할 때 TypeError가 발생합니다.
+    """
+
+    # True이면 append가 저장된 컬렉션 자체를 갱신 (체크포인트·재생이 필요 없음)
+    appends_in_place = False
+    # True이면 로드 직후 모든 컬렉션을 다시 저장해야 함 (형식 변경, 다른 저장소에서 가져오기 등)
+    needs_full_save = False
+
+    @abc.abstractmethod
+    def load(self, name: str, cls=None) -> Optional[list]:
+        """컬렉션을 읽습니다. cls가 있으면 객체로, 없으면 dict로 반환하고, 저장된 적이 없으면 None."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def save(self, name: str, items: list) -> Optional[int]:
+        """컬렉션 전체를 저장하고 기록한 바이트 수를 반환합니다 (내용이 같아 생략하면 None)."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def append(self, records: List[dict]) -> int:
+        """변경 레코드를 덧붙이고 기록한 바이트 수를 반환합니다."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def names(self, prefix: str) -> List[str]:
+        """prefix로 시작하는 보조 컬렉션 이름 목록."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def load_doc(self, name: str) -> dict:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def save_doc(self, name: str, doc: dict) -> int:
+        raise NotImplementedError
+
+    def has_log(self) -> bool:
+        """마지막 체크포인트 이후 append된 레코드가 남아 있는지 여부."""
+        return False
+
+    def replay(self):
+        """마지막 체크포인트 이후 append된 레코드를 순서대로 반환합니다."""
+        return iter(())
+
+    def truncate_log(self):
+        """모든 컬렉션이 저장되었으므로 append 기록을 비웁니다."""
+        self.needs_full_save = False
+
+    def saved(self, collections: dict, changed: bool) -> int:
+        """save가 끝난 뒤 호출됩니다. 추가로 기록한 바이트 수를 반환합니다."""
+        return 0
+
+    def find(self, name: str, where: dict, limit: int = 1) -> Optional[list]:
+        """조건(열 -> 값, None이면 비어 있음)에 맞는 레코드의 기본키를 저장소 인덱스로 찾습니다.
+
+        저장소가 직접 조회할 수 없으면 None을 반환하며, 이때 Repository는 메모리 색인을 씁니다.
+        """
+        return None
+
+    # ---- 여러 프로세스 공유 ----
+    def lock(self):
+        """다른 프로세스와의 읽기-수정-쓰기를 직렬화하는 잠금 (재진입 불가)."""
+        return contextlib.nullcontext()
+
+    def versions(self) -> dict:
+        """컬렉션별 버전 번호. 잠금 안에서 읽어야 합니다."""
+        return self.load_doc(VERSIONS_DOC)
+
+    def bump(self, names) -> dict:
+        """names 컬렉션의 버전 번호를 올리고 새 버전 목록을 반환합니다. 잠금 안에서 호출해야 합니다."""
+        versions = self.versions()
+        for name in names:
+            versions[name] = versions.get(name, 0) + 1
+        self.save_doc(VERSIONS_DOC, versions)
+        return versions
+
+    def close(self):
+        pass
+
+
+class JsonStorage(Storage):
+    """데이터 디렉터리의 JSON 파일(컬렉션마다 <이름>.json)에 저장합니다.
+
+    append는 journal.log에 한 줄씩 덧붙이며, snapshot=True이면 JSON과 함께
+    바이너리 스냅샷을 기록하고 JSON보다 최신이면 우선 로드합니다.
+    """
+
+    def __init__(self, data_dir: str = DEFAULT_DATA_DIR, snapshot: bool = False,
+                 json_format: Optional[str] = None):
         self.data_dir = data_dir
         ensure_data_dir(self.data_dir)
-        self._members_file = os.path.join(self.data_dir, "members.json")
-        self._loans_file = os.path.join(self.data_dir, "loans.json")
-        self._works_file = os.path.join(self.data_dir, "works.json")
-        self._copies_file = os.path.join(self.data_dir, "copies.json")
-        self._deleted_works_file = os.path.join(self.data_dir, "deleted_works.json")
-        
-        # JSON 파일에서 데이터 로드
-        self.works: List[Work] = self._load_works_from_json()
-        self.copies: List[Copy] = self._load_copies_from_json()
-        self.deleted_works: List[Work] = self._load_deleted_works_from_json()
-        
-        # 회원과 대출 정보는 JSON으로 관리 (기존 데이터 호환성 고려)
-        members_data = _read_json(self._members_file, [])
-        self.members: List[Member] = []
+        self._journal_file = os.path.join(self.data_dir, JOURNAL_FILE)
+        self._snapshot_file = os.path.join(self.data_dir, SNAPSHOT_FILE)
+        self._digests = {}  # 컬렉션별 마지막으로 기록한 내용의 해시
+        self.snapshot = snapshot
+        self._snapshot_data = None
+        # 공유 모드의 다른 프로세스는 잠금 안에서만 기록하므로, 잠금을 잡으면 남은 임시 파일은 모두 중단된 기록
+        with self.lock():
+            self._remove_stale_temp_files()
+            # JSON 형식: 지정하면 데이터 디렉터리 설정에 저장되고, 생략하면 저장된 설정을 따름
+            self.json_format = self._resolve_json_format(json_format)
+        if self.snapshot:
+            self._snapshot_data = self._read_snapshot()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.data_dir, *name.split("/")) + ".json"
+
+    def _remove_stale_temp_files(self):
+        """이전 실행이 기록 도중 중단되며 남긴 임시 파일을 지웁니다 (데이터 디렉터리 잠금 안에서 호출)."""
+        for name in os.listdir(self.data_dir):
+            if name.endswith(".tmp"):
+                os.remove(os.path.join(self.data_dir, name))
+
+    @property
+    def compact(self) -> bool:
+        return self.json_format == "compact"
+
+    def _resolve_json_format(self, requested: Optional[str]) -> str:
+        settings_file = os.path.join(self.data_dir, SETTINGS_FILE)
+        settings = _read_json(settings_file, {})
+        current = settings.get("json_format", "pretty")
+        if requested is None or requested == current:
+            return current
+        if requested not in JSON_FORMATS:
+            raise ValueError(f"알 수 없는 JSON 형식: {requested}")
+        settings["json_format"] = requested
+        _write_json(settings_file, settings)
+        # 형식이 바뀌면 로드 후 모든 파일을 새 형식으로 다시 씀
+        self.needs_full_save = True
+        return requested
+
+    # ---- 컬렉션 ----
+    def load(self, name: str, cls=None) -> Optional[list]:
+        if self._snapshot_data is not None and name in self._snapshot_data:
+            rows = self._snapshot_data.pop(name)
+            if cls is None:
+                cols = [f.name for f in fields(COLLECTIONS[name][0])]
+                return [dict(zip(cols, row)) for row in rows]
+            return list(starmap(cls, rows))
+        path = self._path(name)
+        # 다른 프로세스가 바꿨을 수 있으므로 다시 읽은 컬렉션은 다음 저장을 생략하지 않음
+        self._digests.pop(name, None)
+        if not os.path.exists(path):
+            return None
+        return self._load_records(path, cls)
+
+    @staticmethod
+    def _load_records(path: str, cls=None) -> list:
+        """큰 JSON 배열 파일을 원소 단위로 읽어 곧바로 데이터 클래스로 변환합니다.
+
+        전체 dict 목록과 객체 목록이 동시에 메모리에 있지 않으므로 최대 메모리가 절반 수준입니다.
+        """
+        make = (lambda r: r) if cls is None else (lambda r: cls(**r))
+        try:
+            return [make(r) for r in _iter_json_array(path)]
+        except json.JSONDecodeError:
+            # 손상된 파일은 _read_json의 보관·초기화 처리를 따름
+            return [make(r) for r in _read_json(path, [])]
+
+    def save(self, name: str, items: list) -> Optional[int]:
+        payload = _dump_json(_rows(items), self.compact)
+        digest = hashlib.blake2b(payload, digest_size=16).digest()
+        if self._digests.get(name) == digest:
+            return None
+        nbytes = _write_bytes(self._path(name), payload)
+        self._digests[name] = digest
+        return nbytes
+
+    def names(self, prefix: str) -> List[str]:
+        directory, _, stem = prefix.rpartition("/")
+        path = os.path.join(self.data_dir, *directory.split("/")) if directory else self.data_dir
+        if not os.path.isdir(path):
+            return []
+        base = directory + "/" if directory else ""
+        return sorted(base + f[:-5] for f in os.listdir(path) if f.startswith(stem) and f.endswith(".json"))
+
+    def load_doc(self, name: str) -> dict:
+        return _read_json(self._path(name), {})
+
+    def save_doc(self, name: str, doc: dict) -> int:
+        return _write_json(self._path(name), doc)
+
+    def lock(self):
+        return _flock(os.path.join(self.data_dir, LOCK_FILE))
+
+    # ---- 저널 ----
+    def append(self, records: List[dict]) -> int:
+        lines = "".join(
+            json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n" for r in records
+        ).encode("utf-8")
+        with open(self._journal_file, "ab") as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        return len(lines)
+
+    def has_log(self) -> bool:
+        return os.path.exists(self._journal_file)
+
+    def replay(self):
+        if not os.path.exists(self._journal_file):
+            return
+        with open(self._journal_file, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # 기록 도중 중단된 마지막 줄은 무시
+                    return
+
+    def truncate_log(self):
+        super().truncate_log()
+        if os.path.exists(self._journal_file):
+            os.remove(self._journal_file)
+
+    # ---- 바이너리 스냅샷 ----
+    def saved(self, collections: dict, changed: bool) -> int:
+        if not self.snapshot or not (changed or not os.path.exists(self._snapshot_file)):
+            return 0
+        return self._write_snapshot(collections)
+
+    def _read_snapshot(self) -> Optional[dict]:
+        """JSON 파일보다 최신인 스냅샷이 있으면 컬렉션별 필드 튜플 목록을 반환합니다."""
+        if not os.path.exists(self._snapshot_file):
+            return None
+        snapshot_mtime = os.stat(self._snapshot_file).st_mtime_ns
+        for name in COLLECTIONS:
+            path = self._path(name)
+            if os.path.exists(path) and os.stat(path).st_mtime_ns > snapshot_mtime:
+                return None  # JSON이 더 최신 (수동 편집 등)
+        with open(self._snapshot_file, "rb") as f:
+            header = f.read(SNAPSHOT_HEADER.size)
+            if len(header) != SNAPSHOT_HEADER.size:
+                return None
+            magic, version, length = SNAPSHOT_HEADER.unpack(header)
+            if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                return None
+            body = f.read(length)
+        if len(body) != length:
+            return None
+        return pickle.loads(body)
+
+    def _write_snapshot(self, collections: dict) -> int:
+        """모든 컬렉션을 필드 튜플 목록으로 묶어 스냅샷 파일에 기록합니다."""
+        data = {}
+        for name, (cls, _) in COLLECTIONS.items():
+            row = attrgetter(*(f.name for f in fields(cls)))
+            data[name] = [row(o) for o in collections[name]]
+        body = pickle.dumps(data, protocol=5)
+        header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(body))
+        return _write_bytes(self._snapshot_file, header + body)
+
+
+class SqliteStorage(Storage):
+    """SQLite 파일(library.db)에 저장합니다.
+
+    append는 변경된 행만 한 트랜잭션으로 upsert/delete 합니다. 처음 만든 DB는
+    같은 디렉터리의 JSON 데이터(저널 포함)를 가져와 채웁니다.
+
+    대출·반납의 단건 조회(기본키, 도서의 대출 가능 복본, 복본의 미반납 대출)는 find()로
+    SQLite 인덱스에서 한 행만 찾고, 목록·검색·정합성 검사는 Repository의 메모리 색인을 씁니다.
+    시작할 때 모든 테이블을 메모리로 읽으므로 데이터 크기의 상한은 JSON 저장과 같습니다(메모리).
+    """
+
+    appends_in_place = True
+
+    SCHEMA_VERSION = 1
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS works (
+            work_id INTEGER PRIMARY KEY,
+            title TEXT NOT NULL,
+            author_key TEXT NOT NULL,
+            author_display TEXT NOT NULL,
+            registered_date TEXT NOT NULL,
+            deleted_date TEXT
+        );
+        CREATE TABLE IF NOT EXISTS deleted_works (
+            work_id INTEGER PRIMARY KEY,
+            title TEXT NOT NULL,
+            author_key TEXT NOT NULL,
+            author_display TEXT NOT NULL,
+            registered_date TEXT NOT NULL,
+            deleted_date TEXT
+        );
+        CREATE TABLE IF NOT EXISTS copies (
+            copy_id INTEGER PRIMARY KEY,
+            work_id INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            registered_date TEXT NOT NULL,
+            deleted_date TEXT
+        );
+        CREATE TABLE IF NOT EXISTS members (
+            student_id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            phone TEXT NOT NULL,
+            password TEXT NOT NULL,
+            registered_date TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS loans (
+            loan_id INTEGER PRIMARY KEY,
+            copy_id INTEGER NOT NULL,
+            work_id INTEGER NOT NULL,
+            student_id TEXT NOT NULL,
+            loan_date TEXT NOT NULL,
+            due_date TEXT NOT NULL,
+            return_date TEXT
+        );
+        CREATE TABLE IF NOT EXISTS documents (
+            name TEXT PRIMARY KEY,
+            body TEXT NOT NULL
+        );
+        -- find()가 쓰는 보조 인덱스: 도서의 대출 가능 복본, 복본의 미반납 대출
+        CREATE INDEX IF NOT EXISTS idx_copies_work_status ON copies (work_id, status);
+        CREATE INDEX IF NOT EXISTS idx_loans_open_copy ON loans (copy_id) WHERE return_date IS NULL;
+    """
+
+    def __init__(self, data_dir: str = DEFAULT_DATA_DIR, db_name: str = "library.db"):
+        self.data_dir = data_dir
+        ensure_data_dir(data_dir)
+        self._db_file = os.path.join(data_dir, db_name)
+        # 백그라운드 기록 스레드에서도 기록하므로 스레드 검사를 끄고 Repository._lock으로 직렬화
+        self.conn = sqlite3.connect(self._db_file, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=FULL")
+        self.conn.executescript(self.SCHEMA)
+        self._columns = {name: [f.name for f in fields(cls)] for name, (cls, _) in COLLECTIONS.items()}
+        self._upsert = {name: self._upsert_sql(name) for name in COLLECTIONS}
+        # 처음 열린 DB: 기존 JSON 데이터를 읽어 오고, 첫 전체 저장이 끝나면 초기화 완료로 표시
+        self._seed: Optional[JsonStorage] = None
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] == 0:
+            self._seed = JsonStorage(data_dir)
+            self.needs_full_save = True
+
+    @staticmethod
+    def _upsert_sql(name: str) -> str:
+        cls, pk = COLLECTIONS[name]
+        cols = [f.name for f in fields(cls)]
+        updates = ", ".join(f"{c}=excluded.{c}" for c in cols if c != pk)
+        return (f"INSERT INTO {name} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))}) "
+                f"ON CONFLICT({pk}) DO UPDATE SET {updates}")
+
+    def load(self, name: str, cls=None) -> Optional[list]:
+        if self._seed is not None:
+            return self._seed.load(name, cls)
+        if name not in COLLECTIONS:
+            doc = self.conn.execute("SELECT body FROM documents WHERE name = ?", (name,)).fetchone()
+            if doc is None:
+                return None
+            rows = json.loads(doc[0])
+            return rows if cls is None else [cls(**r) for r in rows]
+        cols = self._columns[name]
+        rows = self.conn.execute(f"SELECT {', '.join(cols)} FROM {name} ORDER BY rowid")
+        if cls is None:
+            return [dict(zip(cols, row)) for row in rows]
+        return list(starmap(cls, rows))
+
+    def save(self, name: str, items: list) -> Optional[int]:
+        with self.conn:
+            if name not in COLLECTIONS:
+                self._put_document(name, _rows(items))
+                return 0
+            cols = self._columns[name]
+            self.conn.execute(f"DELETE FROM {name}")
+            self.conn.executemany(self._upsert[name], ([getattr(o, c) for c in cols] for o in items))
+        return 0
+
+    def append(self, records: List[dict]) -> int:
+        with self.conn:
+            for rec in records:
+                name = rec["c"]
+                if rec["op"] == "put":
+                    self.conn.execute(self._upsert[name], [rec["v"][c] for c in self._columns[name]])
+                else:
+                    pk = COLLECTIONS[name][1]
+                    self.conn.execute(f"DELETE FROM {name} WHERE {pk} = ?", (rec["k"],))
+        return 0
+
+    def find(self, name: str, where: dict, limit: int = 1) -> Optional[list]:
+        if self._seed is not None or name not in COLLECTIONS:
+            return None  # 첫 전체 저장 전에는 테이블이 비어 있음
+        unknown = set(where) - set(self._columns[name])
+        if unknown:
+            raise KeyError(", ".join(sorted(unknown)))
+        cond = " AND ".join(f"{c} IS NULL" if v is None else f"{c} = ?" for c, v in where.items())
+        params = [v for v in where.values() if v is not None]
+        rows = self.conn.execute(f"SELECT {COLLECTIONS[name][1]} FROM {name} WHERE {cond} "
+                                 f"ORDER BY rowid LIMIT ?", (*params, limit))
+        return [row[0] for row in rows]
+
+    def names(self, prefix: str) -> List[str]:
+        rows = self.conn.execute("SELECT name FROM documents WHERE name LIKE ? ORDER BY name",
+                                 (prefix.replace("%", "\\%") + "%",))
+        return [row[0] for row in rows]
+
+    def _put_document(self, name: str, doc):
+        self.conn.execute("INSERT INTO documents (name, body) VALUES (?, ?) "
+                          "ON CONFLICT(name) DO UPDATE SET body=excluded.body",
+                          (name, json.dumps(doc, ensure_ascii=False)))
+
+    def load_doc(self, name: str) -> dict:
+        if self._seed is not None:
+            return self._seed.load_doc(name)
+        doc = self.conn.execute("SELECT body FROM documents WHERE name = ?", (name,)).fetchone()
+        return json.loads(doc[0]) if doc else {}
+
+    def save_doc(self, name: str, doc: dict) -> int:
+        with self.conn:
+            self._put_document(name, doc)
+        return 0
+
+    def lock(self):
+        return _flock(os.path.join(self.data_dir, LOCK_FILE))
+
+    def has_log(self) -> bool:
+        return self._seed is not None and self._seed.has_log()
+
+    def replay(self):
+        return self._seed.replay() if self._seed is not None else iter(())
+
+    def truncate_log(self):
+        # 원본 JSON 디렉터리(저널 포함)는 그대로 두고, 가져오기가 끝났음만 기록
+        super().truncate_log()
+        if self._seed is None:
+            return
+        with self.conn:
+            # 보관된 대출 세그먼트와 색인도 함께 가져옴
+            for name in self._seed.names(f"{ARCHIVE_DIR}/loans-"):
+                self._put_document(name, self._seed.load(name))
+            index = self._seed.load_doc(f"{ARCHIVE_DIR}/index")
+            if index:
+                self._put_document(f"{ARCHIVE_DIR}/index", index)
+        self.conn.execute(f"PRAGMA user_version={self.SCHEMA_VERSION}")
+        self._seed = None
+
+    def close(self):
+        self.conn.close()
+
+
+class MemoryStorage(Storage):
+    """파일을 전혀 쓰지 않는 메모리 저장소 (자가 테스트·벤치마크용).
+
+    같은 MemoryStorage로 Repository를 다시 만들면 저장된 내용을 그대로 읽습니다.
+    """
+
+    appends_in_place = True
+
+    def __init__(self):
+        self._data = {}  # 컬렉션 이름 -> {기본키: 레코드 dict} (보조 컬렉션은 dict 목록)
+        self._docs = {}
+
+    def load(self, name: str, cls=None) -> Optional[list]:
+        if name not in self._data:
+            return None
+        rows = self._data[name]
+        rows = rows.values() if isinstance(rows, dict) else rows
+        return [dict(r) for r in rows] if cls is None else [cls(**r) for r in rows]
+
+    def save(self, name: str, items: list) -> Optional[int]:
+        if name in COLLECTIONS:
+            pk = COLLECTIONS[name][1]
+            self._data[name] = {getattr(o, pk): dict(vars(o)) for o in items}
+        else:
+            self._data[name] = [dict(vars(o)) for o in items]
+        return 0
+
+    def append(self, records: List[dict]) -> int:
+        for rec in records:
+            rows = self._data.setdefault(rec["c"], {})
+            if rec["op"] == "put":
+                pk = COLLECTIONS[rec["c"]][1]
+                rows[rec["v"][pk]] = rec["v"]
+            else:
+                rows.pop(rec["k"], None)
+        return 0
+
+    def names(self, prefix: str) -> List[str]:
+        return sorted(n for n in self._data if n.startswith(prefix))
+
+    def load_doc(self, name: str) -> dict:
+        return dict(self._docs.get(name, {}))
+
+    def save_doc(self, name: str, doc: dict) -> int:
+        self._docs[name] = dict(doc)
+        return 0
+
+# -------------------- 저장소 --------------------
+
+@dataclass
+class PersistStats:
+    """persist() 저장량 통계 (last_*: 마지막 호출, 나머지: 누적)"""
+    calls: int = 0  # 실제 기록 횟수 (그룹 커밋으로 합쳐진 호출은 한 번)
+    files: int = 0
+    bytes: int = 0
+    skipped: int = 0  # 변경 표시는 되었지만 내용이 같아 건너뛴 파일 수
+    last_files: int = 0
+    last_bytes: int = 0
+    queue_depth: int = 0  # 백그라운드 기록: 아직 기록되지 않은 persist() 요청 수
+    max_queue_depth: int = 0
+    last_write_ms: float = 0.0  # 기록 한 번에 걸린 시간
+    max_write_ms: float = 0.0
+    last_lag_ms: float = 0.0  # 백그라운드 기록: 가장 오래 기다린 요청이 기록되기까지 걸린 시간
+
+
+class CollectionIndex:
+    """컬렉션 하나의 메모리 색인. 색인을 만든 리스트(items)와 길이(size)로 최신 여부를 확인합니다.
+
+    리스트 자체는 Repository가 바꾸고, 색인은 add/remove/update로 그 변경을 따라갑니다.
+    """
+
+    def __init__(self, items: list, pk: str):
+        self.items = items
+        self.size = len(items)
+        self.pk = attrgetter(pk)
+        self.by_pk = {}  # 기본키 -> 레코드 (기본키가 중복되면 리스트에서 먼저 나온 레코드)
+        self.duplicates = Counter()  # 기본키 -> by_pk에 든 레코드 외에 같은 기본키를 가진 레코드 수
+        for obj in items:
+            self._add(obj)
+
+    def add(self, obj):
+        """리스트 끝에 추가된 레코드를 반영합니다."""
+        self.size += 1
+        self._add(obj)
+
+    def _add(self, obj):
+        key = self.pk(obj)
+        if self.by_pk.setdefault(key, obj) is not obj:
+            self.duplicates[key] += 1
+
+    def remove(self, obj):
+        """리스트에서 제거된 레코드를 반영합니다. 기본키가 중복된 경우에만 리스트를 훑습니다."""
+        self.size -= 1
+        key = self.pk(obj)
+        if not self.duplicates.get(key):
+            if self.by_pk.get(key) is obj:
+                del self.by_pk[key]
+            return
+        self.duplicates[key] -= 1
+        if not self.duplicates[key]:
+            del self.duplicates[key]
+        if self.by_pk.get(key) is obj:
+            # 같은 기본키의 다음 레코드로 대체
+            other = next((o for o in self.items if self.pk(o) == key), None)
+            if other is None:
+                del self.by_pk[key]
+            else:
+                self.by_pk[key] = other
+
+    def update(self, obj):
+        """레코드가 제자리에서 수정되었음을 반영합니다 (기본키는 바뀌지 않음)."""
+
+
+class CopyIndex(CollectionIndex):
+    """복본 색인: 기본키에 더해 도서별 복본 목록, 대출 가능 복본 수와 대출 가능 복본 풀을 유지합니다.
+
+    상태 변화는 복본마다 마지막으로 본 상태와 비교해 계산하므로, 상태를 바꾼 뒤에는
+    touch("copies", ...)로 알려야 합니다.
+    """
+
+    def __init__(self, items: list, pk: str):
+        self.by_work = {}  # work_id -> {id(복본): 복본} (리스트 순서)
+        self.available = Counter()  # work_id -> status가 available인 복본 수
+        self.free = {}  # work_id -> deque[복본]: 대출할 복본 풀 (앞에서 꺼내고 반납되면 뒤에 넣음)
+        self._pooled = set()  # free에 들어 있는 복본의 id
+        self._status = {}  # id(복본) -> 마지막으로 본 상태
+        super().__init__(items, pk)
+
+    def _add(self, obj):
+        super()._add(obj)
+        _group_add(self.by_work, obj.work_id, obj)
+        self._status[id(obj)] = obj.status
+        if obj.status == "available":
+            self.available[obj.work_id] += 1
+            self._push_free(obj)
+
+    def next_free(self, work_id: int):
+        """풀의 맨 앞에 있는 대출 가능 복본 (없으면 None).
+
+        대출·삭제·제거된 복본은 풀에서 바로 빼지 않으므로 여기서 만나면 버립니다.
+        """
+        pool = self.free.get(work_id)
+        while pool:
+            obj = pool[0]
+            if id(obj) in self._status and obj.status == "available" and obj.deleted_date is None:
+                return obj
+            pool.popleft()
+            self._pooled.discard(id(obj))
+        return None
+
+    def _push_free(self, obj):
+        if obj.deleted_date is None and id(obj) not in self._pooled:
+            self.free.setdefault(obj.work_id, deque()).append(obj)
+            self._pooled.add(id(obj))
+
+    def remove(self, obj):
+        super().remove(obj)
+        _group_remove(self.by_work, obj.work_id, obj)
+        if self._status.pop(id(obj)) == "available":
+            self.available[obj.work_id] -= 1
+
+    def update(self, obj):
+        old = self._status.get(id(obj))
+        if old is None or old == obj.status:
+            return
+        self._status[id(obj)] = obj.status
+        if old == "available":
+            self.available[obj.work_id] -= 1
+            pool = self.free.get(obj.work_id)
+            if pool and pool[0] is obj:  # 대출: 방금 꺼낸 맨 앞 복본
+                pool.popleft()
+                self._pooled.discard(id(obj))
+        elif obj.status == "available":
+            self.available[obj.work_id] += 1
+            self._push_free(obj)  # 반납: 풀 뒤에 넣음
+
+
+class LoanIndex(CollectionIndex):
+    """대출 색인: 기본키에 더해 미반납 대출을 복본·회원·도서별로, 모든 대출을 회원별로 묶어 둡니다.
+
+    반납 여부는 대출마다 마지막으로 본 값과 비교하므로, return_date를 바꾼 뒤에는
+    touch("loans", ...)로 알려야 합니다.
+    """
+
+    def __init__(self, items: list, pk: str):
+        self.open_by_copy = {}  # copy_id -> {id(대출): 대출}
+        self.open_by_member = {}  # student_id -> {id(대출): 대출}
+        self.open_by_work = {}  # work_id -> {id(대출): 대출}
+        self.by_member = {}  # student_id -> {id(대출): 대출} (반납된 대출 포함, 리스트 순서)
+        self._open = {}  # id(대출) -> 마지막으로 본 미반납 여부
+        super().__init__(items, pk)
+
+    def _add(self, obj):
+        super()._add(obj)
+        _group_add(self.by_member, obj.student_id, obj)
+        self._open[id(obj)] = obj.return_date is None
+        if obj.return_date is None:
+            self._add_open(obj)
+
+    def remove(self, obj):
+        super().remove(obj)
+        _group_remove(self.by_member, obj.student_id, obj)
+        if self._open.pop(id(obj)):
+            self._remove_open(obj)
+
+    def update(self, obj):
+        was_open = self._open.get(id(obj))
+        is_open = obj.return_date is None
+        if was_open is None or was_open == is_open:
+            return
+        self._open[id(obj)] = is_open
+        if is_open:
+            self._add_open(obj)
+        else:
+            self._remove_open(obj)
+
+    def _add_open(self, obj):
+        _group_add(self.open_by_copy, obj.copy_id, obj)
+        _group_add(self.open_by_member, obj.student_id, obj)
+        _group_add(self.open_by_work, obj.work_id, obj)
+
+    def _remove_open(self, obj):
+        _group_remove(self.open_by_copy, obj.copy_id, obj)
+        _group_remove(self.open_by_member, obj.student_id, obj)
+        _group_remove(self.open_by_work, obj.work_id, obj)
+
+
+class WorkIndex(CollectionIndex):
+    """도서 색인: 기본키에 더해 (제목, 저자키)별 도서를 묶어 둡니다 (삭제된 도서 포함)."""
+
+    def __init__(self, items: list, pk: str):
+        self.by_title_author = {}  # (title, author_key) -> {id(도서): 도서}
+        super().__init__(items, pk)
+
+    def _add(self, obj):
+        super()._add(obj)
+        _group_add(self.by_title_author, (obj.title, obj.author_key), obj)
+
+    def remove(self, obj):
+        super().remove(obj)
+        _group_remove(self.by_title_author, (obj.title, obj.author_key), obj)
+
+
+class MemberIndex(CollectionIndex):
+    """회원 색인: 기본키(학번)에 더해 연락처별 회원을 묶어 둡니다."""
+
+    def __init__(self, items: list, pk: str):
+        self.by_phone = {}  # phone -> {id(회원): 회원}
+        super().__init__(items, pk)
+
+    def _add(self, obj):
+        super()._add(obj)
+        _group_add(self.by_phone, obj.phone, obj)
+
+    def remove(self, obj):
+        super().remove(obj)
+        _group_remove(self.by_phone, obj.phone, obj)
+
+
+def _group_add(groups: dict, key, obj):
+    """키별 묶음에 레코드를 추가합니다. 묶음은 id(레코드)를 키로 하는 dict라 추가 순서를 유지하고 O(1)로 뺄 수 있습니다."""
+    groups.setdefault(key, {})[id(obj)] = obj
+
+
+def _group_remove(groups: dict, key, obj):
+    group = groups.get(key)
+    if group is not None:
+        group.pop(id(obj), None)
+        if not group:
+            del groups[key]
+
+
+INDEX_TYPES = {"works": WorkIndex, "copies": CopyIndex, "members": MemberIndex, "loans": LoanIndex}  # 기본은 CollectionIndex (기본키 색인만)
+
+
+class Repository:
+    def __init__(self, data_dir: str = DEFAULT_DATA_DIR, journal: bool = False,
+                 checkpoint_every: int = JOURNAL_CHECKPOINT_EVERY,
+                 group_commit_ms: int = GROUP_COMMIT_MS, snapshot: bool = False,
+                 archive_days: Optional[int] = None, json_format: Optional[str] = None,
+                 storage: Optional[Storage] = None, shared: bool = False,
+                 background: bool = False, excel_importer: Optional[str] = None,
+                 catalog: str = EXCEL_FILE):
+        if shared and fcntl is None:
+            raise ValueError("공유 모드에는 파일 잠금(fcntl)이 필요하지만 이 플랫폼에서는 사용할 수 없습니다.")
+        # 저장 백엔드: 지정하지 않으면 data_dir의 JSON 파일
+        if storage is None:
+            storage = JsonStorage(data_dir, snapshot=snapshot, json_format=json_format)
+        self.storage = storage
+        self.data_dir = getattr(storage, "data_dir", None)
+
+        # 변경 추적: 수정된 컬렉션만 다시 저장하고, 같은 내용이면 쓰기를 생략
+        self._dirty = set()
+        self._checkpoint_due = False  # mark_dirty(): 다음 persist()를 체크포인트로 수행
+        self.persist_stats = PersistStats()
+        self._indexes = {}  # 컬렉션 -> CollectionIndex (처음 조회할 때 만들고 add/remove/touch에서 갱신)
+
+        # 엑셀 초기화 방식: 지정하지 않으면 pandas가 있을 때 pandas, 없으면 스트리밍
+        if excel_importer is None:
+            excel_importer = "pandas" if _has_pandas() else "stream"
+        if excel_importer not in EXCEL_IMPORTERS:
+            raise ValueError(f"알 수 없는 엑셀 가져오기 방식: {excel_importer}")
+        self.excel_importer = excel_importer
+        self.catalog = catalog  # 빈 데이터 디렉터리를 채울 도서 목록 (.xlsx, .csv, .parquet)
+
+        # 대출 보관: 반납 후 archive_days가 지난 대출은 self.loans에서 빼서 세그먼트로 이동
+        self.archive_days = archive_days
+        self._archived: Optional[List[Loan]] = None  # 기록 조회 시 지연 로드
+        self._archived_by_member = (None, {})  # (회원별로 묶은 보관 대출 목록, student_id -> [대출])
+
+        # 저널 모드: 변경마다 레코드 한 줄을 덧붙이고, 일정 개수마다 체크포인트
+        self.journal = journal
+        self.checkpoint_every = checkpoint_every
+        self._pending: List[dict] = []
+        self._journal_count = 0
+        # 공유 모드: 여러 프로세스가 같은 data_dir을 쓸 때 잠금 안에서 다른 프로세스의 커밋을 반영
+        self.shared = shared
+        self._versions = {}  # 마지막으로 반영한 컬렉션별 버전
+        self._in_transaction = False
+        self.reloads = 0  # 다른 프로세스의 변경으로 컬렉션을 다시 읽은 횟수
+
+        # 변경 레코드(_pending)를 수집할지 여부: 저널 모드, 행 단위로 반영하는 백엔드, 공유 모드
+        self._log_changes = journal or storage.appends_in_place or shared
+
+        # 기록 스레드가 group_commit_ms 창 안의 persist() 요청을 한 번에 기록.
+        # 그룹 커밋(background=False)은 호출한 쪽이 자기 변경이 기록될 때까지 기다리고,
+        # 백그라운드 기록(background=True)은 기다리지 않음 (flush() 전에 중단되면 창 안의 변경은 유실)
+        self.group_commit_ms = group_commit_ms
+        self._background = background
+        self._lock = threading.RLock()
+        self._wake = threading.Condition(self._lock)
+        self._queued_at = 0.0  # 기록되지 않은 요청 중 가장 오래된 것의 시각
+        self._write_seq = 0  # 끝난 기록 횟수: 그룹 커밋에서 기다리던 변경이 기록되었는지 확인
+        self._write_error: Optional[Exception] = None  # 기록 스레드가 재시도를 멈추게 한 오류
+        self._closing = False
+        self._writer: Optional[threading.Thread] = None
+        if background or group_commit_ms > 0:
+            self._writer = threading.Thread(target=self._writer_loop, name="repository-writer", daemon=True)
+
+        with self.storage.lock() if shared else contextlib.nullcontext():
+            self._load()
+            self._versions = self.storage.versions() if shared else {}
+        if self._writer is not None:
+            self._writer.start()
+
+    @property
+    def background(self) -> bool:
+        """persist()가 기록을 기다리지 않고 반환하는지 여부."""
+        return self._background
+
+    def _load(self):
+        """저장소에서 데이터를 로드하고 마지막 체크포인트 이후의 변경분을 재생합니다."""
+        self.works: List[Work] = self._load_works()
+        self.copies: List[Copy] = self.storage.load("copies", Copy) or []
+        self.deleted_works: List[Work] = self.storage.load("deleted_works", Work) or []
+        self.members: List[Member] = self._load_members()
+        self.loans: List[Loan] = self.storage.load("loans", Loan) or []
+
+        # 마지막 체크포인트 이후의 변경분을 재생
+        replayed = self._replay(self.storage.replay())
+        if self.storage.needs_full_save:
+            self.checkpoint(full=True)
+        elif replayed:
+            if self.journal and not self.storage.appends_in_place:
+                self._journal_count = replayed
+            else:
+                # 저널 모드가 아니면 재생한 내용을 곧바로 반영
+                self.checkpoint()
+
+    def _load_members(self) -> List[Member]:
+        """회원 정보는 기존 데이터 호환성을 고려해 정리하며 로드합니다."""
+        members_data = self.storage.load("members") or []
+        members = []
         for m in members_data:
             # 빈 객체나 필수 필드가 없는 데이터는 건너뛰기
             if not m or 'student_id' not in m or not m.get('student_id'):
                 continue
-            
+
             # 기존 데이터에 password가 없는 경우 기본값 설정
             if 'password' not in m:
                 m['password'] = 'password123'  # 기본 비밀번호
-            
+
             # username 필드가 있으면 제거 (호환성을 위해)
             if 'username' in m:
                 del m['username']
-            
+
             # 필수 필드들이 모두 있는지 확인
             required_fields = ['student_id', 'name', 'phone', 'registered_date']
             if all(field in m and m[field] for field in required_fields):
-                self.members.append(Member(**m))
-        
-        self.loans: List[Loan] = [Loan(**l) for l in _read_json(self._loans_file, [])]
-
-    def _load_works_from_json(self) -> List[Work]:
-        """JSON 파일에서 도서 데이터를 로드합니다."""
-        works_data = _read_json(self._works_file, [])
-        if not works_data:
-            # JSON 파일이 없으면 엑셀에서 초기 데이터 생성
+                members.append(Member(**m))
+        return members
+
+    def _load_works(self) -> List[Work]:
+        """도서 데이터를 로드합니다."""
+        works = self.storage.load("works", Work)
+        if not works:
+            if self.storage.has_log():
+                # 체크포인트 전의 도서는 저널에만 있으므로 엑셀로 다시 초기화하지 않음
+                return []
+            # 저장된 도서가 없으면 엑셀에서 초기 데이터 생성
             return self._initialize_from_excel()
-        return [Work(**w) for w in works_data]
-
-    def _load_copies_from_json(self) -> List[Copy]:
-        """JSON 파일에서 복본 데이터를 로드합니다."""
-        copies_data = _read_json(self._copies_file, [])
-        if not copies_data:
-            return []
-        return [Copy(**c) for c in copies_data]
-
-    def _load_deleted_works_from_json(self) -> List[Work]:
-        """JSON 파일에서 삭제된 도서 데이터를 로드합니다."""
-        deleted_data = _read_json(self._deleted_works_file, [])
-        return [Work(**w) for w in deleted_data]
-
+        return works
 
     def _initialize_from_excel(self) -> List[Work]:
-        """엑셀 파일에서 초기 데이터를 생성하고 JSON으로 저장합니다."""
-        works = self._load_works_from_excel()
+        """엑셀 파일에서 초기 데이터를 생성하고 저장합니다."""
+        if self.excel_importer == "stream":
+            works, copies = self._load_excel_streaming()
+        else:
+            works = self._load_works_from_excel()
+            # 복본도 생성
+            copies = self._generate_copies_from_works(works) if works else []
         if works:
-            # JSON 파일로 저장
-            _write_json(self._works_file, [asdict(w) for w in works])
-            # 복본도 생성하여 저장
-            copies = self._generate_copies_from_works(works)
-            _write_json(self._copies_file, [asdict(c) for c in copies])
-            print("엑셀 파일에서 초기 데이터를 JSON으로 변환했습니다.")
+            self.storage.save("works", works)
+            self.storage.save("copies", copies)
+            print("엑셀 파일에서 초기 데이터를 생성했습니다.")
         else:
-            # 엑셀 파일이 없으면 빈 JSON 파일 생성
-            _write_json(self._works_file, [])
-            _write_json(self._copies_file, [])
+            # 엑셀 파일이 없으면 빈 목록으로 저장
+            self.storage.save("works", [])
+            self.storage.save("copies", [])
             print("엑셀 파일이 없어 빈 도서 목록으로 시작합니다.")
         return works
 
     def _load_works_from_excel(self) -> List[Work]:
         """엑셀 파일에서 도서 데이터를 로드합니다."""
         try:
-            if not os.path.exists(EXCEL_FILE):
-                print(f"엑셀 파일을 찾을 수 없습니다: {EXCEL_FILE}")
+            if not os.path.exists(self.catalog):
+                print(f"엑셀 파일을 찾을 수 없습니다: {self.catalog}")
                 print("YES24 크롤러를 먼저 실행해주세요: python yes24_crawler.py")
                 return []
             
-            self.excel_df = pd.read_excel(EXCEL_FILE, engine='openpyxl')  # 복본 생성에 사용하기 위해 저장
-            works = []
-            
-            for index, row in self.excel_df.iterrows():
-                work = Work(
-                    work_id=index + 1,  # 1부터 시작하는 ID
-                    title=str(row['제목']),
-                    author_key=norm_author_key(str(row['저자'])),
-                    author_display=str(row['저자']),
-                    registered_date=str(row['등록일']),
-                    deleted_date=None
-                )
-                works.append(work)
-            
+            self.excel_df = self._read_catalog_frame(self.catalog)  # 복본 생성에 사용하기 위해 저장
+            works = self._works_from_frame(self.excel_df)
+
             print(f"엑셀 파일에서 {len(works)}개의 도서를 로드했습니다.")
             return works
             
@@ -220,61 +1338,632 @@ class Repository:
             print("YES24 크롤러를 먼저 실행해주세요: python yes24_crawler.py")
             return []
 
+    def read_excel_catalog(self, path: Optional[str] = None):
+        """카탈로그(기본: self.catalog)의 도서 목록(행 순서대로 work_id 1..n)과 행별 복본 수를 읽습니다.
+
+        파일 형식은 확장자(.xlsx, .csv, .parquet)로 정하며, 읽지 못하면 예외가 발생합니다.
+        """
+        path = path or self.catalog
+        if self.excel_importer == "stream":
+            return _catalog_from_rows(_iter_catalog_rows(path))
+        self.excel_df = self._read_catalog_frame(path)
+        works = self._works_from_frame(self.excel_df)
+        return works, self._copy_counts(self.excel_df, works)
+
+    def _load_excel_streaming(self):
+        """카탈로그를 한 행씩 읽어 도서와 복본을 바로 만듭니다 (데이터프레임 없음).
+
+        엑셀은 openpyxl read_only 모드, CSV는 csv 모듈, Parquet은 pyarrow 레코드 배치로 읽습니다.
+        """
+        try:
+            if not os.path.exists(self.catalog):
+                print(f"엑셀 파일을 찾을 수 없습니다: {self.catalog}")
+                print("YES24 크롤러를 먼저 실행해주세요: python yes24_crawler.py")
+                return [], []
+
+            works, counts = _catalog_from_rows(_iter_catalog_rows(self.catalog))
+            # 도서마다 책개수만큼, 복본 ID는 전체에 걸쳐 1부터 순서대로
+            per_copy = [work for work, count in zip(works, counts) for _ in range(count)]
+            copies = [Copy(copy_id, work.work_id, "available", work.registered_date)
+                      for copy_id, work in enumerate(per_copy, 1)]
+
+            print(f"엑셀 파일에서 {len(works)}개의 도서를 로드했습니다.")
+            print(f"총 {len(copies)}개의 복본을 생성했습니다.")
+            return works, copies
+
+        except Exception as e:
+            print(f"엑셀 파일 로드 중 오류: {e}")
+            print("YES24 크롤러를 먼저 실행해주세요: python yes24_crawler.py")
+            return [], []
+
+    @staticmethod
+    def _read_catalog_frame(path: str):
+        """확장자에 맞게 카탈로그를 데이터프레임으로 읽습니다.
+
+        CSV와 Parquet은 열 단위로 바로 읽으므로 캐시하지 않습니다. CSV의 문자열 열은 스트리밍
+        경로와 같도록 형 변환 없이 읽고, 빈 칸만 결측값으로 둡니다. 카탈로그 열이 모두 빈 행은 버리고
+        인덱스는 항상 0부터 다시 매깁니다.
+        """
+        pd = _pandas()
+        ext = os.path.splitext(path)[1].lower()
+        if ext == ".csv":
+            df = pd.read_csv(path, encoding="utf-8-sig", dtype={c: str for c in EXCEL_COLUMNS[:3]},
+                             keep_default_na=False, na_values={c: [""] for c in EXCEL_COLUMNS})
+        elif ext == ".parquet":
+            df = pd.read_parquet(path)
+            _column_index(df.columns, EXCEL_COLUMNS)
+            df = df[[c for c in EXCEL_COLUMNS if c in df.columns]]
+        elif ext in (".xlsx", ".xlsm"):
+            df = Repository._read_workbook(path)
+        else:
+            raise ValueError(f"지원하지 않는 카탈로그 형식입니다 ({ext or '확장자 없음'})")
+        # 카탈로그 열이 모두 빈 행은 스트리밍 경로(_catalog_from_rows)와 같이 건너뜀
+        df = df.dropna(how="all", subset=[c for c in EXCEL_COLUMNS if c in df.columns])
+        # 도서 ID는 행 번호로 매기므로, 파일에 저장된 인덱스(필터링한 Parquet 등)는 버림
+        return df.reset_index(drop=True)
+
+    @staticmethod
+    def _read_workbook(path: str):
+        """엑셀 파일을 읽습니다. 내용 해시가 같은 파싱 결과가 캐시에 있으면 openpyxl 파싱을 생략합니다."""
+        pd = _pandas()
+        h = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        cache_path = path + EXCEL_CACHE_SUFFIX
+        if os.path.exists(cache_path):
+            try:
+                with open(cache_path, "rb") as f:
+                    cached = pickle.load(f)
+                if cached["digest"] == digest:
+                    return cached["frame"]
+            except Exception:
+                pass  # 손상되었거나 다른 버전의 캐시는 다시 만듦
+        df = pd.read_excel(path, engine='openpyxl')
+        try:
+            _write_bytes(cache_path, pickle.dumps({"digest": digest, "frame": df}, protocol=5))
+        except OSError as e:
+            print(f"엑셀 캐시를 저장하지 못했습니다: {e}")
+        return df
+
+    @staticmethod
+    def _works_from_frame(df) -> List[Work]:
+        """엑셀 데이터프레임을 열 단위로 변환해 도서 목록을 만듭니다 (행마다 iterrows를 돌지 않음).
+
+        셀 값은 str()로 바꾸므로 빈 셀은 'nan', 날짜 셀은 str(Timestamp) 형식이 됩니다.
+        """
+        pd = _pandas()
+        authors = df['저자'].map(str)
+        # 저자는 중복이 많으므로 고유값만 norm_author_key와 같게 정규화(소문자, 공백 한 칸)한 뒤 펼침
+        codes, uniques = pd.factorize(authors)
+        author_keys = uniques.str.lower().str.split().str.join(" ").take(codes)
+        return list(starmap(Work, zip(
+            (df.index + 1).tolist(),  # 1부터 시작하는 ID
+            df['제목'].map(str).tolist(),
+            author_keys.tolist(),
+            authors.tolist(),
+            df['등록일'].map(str).tolist(),
+        )))
+
     def _generate_copies_from_works(self, works: List[Work] = None) -> List[Copy]:
         """도서 목록으로부터 복본을 생성합니다. 엑셀 파일의 책개수 정보를 반영합니다."""
         if works is None:
             works = self.works
-        copies = []
-        copy_id = 1
-        
-        for work in works:
-            # 엑셀 파일에서 해당 도서의 책개수 정보 가져오기
-            copies_count = 1  # 기본값
-            if hasattr(self, 'excel_df'):
-                try:
-                    # work_id는 1부터 시작하므로 index는 work_id - 1
-                    row_index = work.work_id - 1
-                    if row_index < len(self.excel_df):
-                        copies_count = int(self.excel_df.iloc[row_index]['책개수'])
-                except:
-                    copies_count = 1  # 오류 시 기본값
-            
-            # 지정된 개수만큼 복본 생성
-            for _ in range(copies_count):
-                copy = Copy(
-                    copy_id=copy_id,
-                    work_id=work.work_id,
-                    status="available",
-                    registered_date=work.registered_date,
-                    deleted_date=None
-                )
-                copies.append(copy)
-                copy_id += 1
-        
+        copies = self._copies_from_frame(getattr(self, 'excel_df', None), works)
         print(f"총 {len(copies)}개의 복본을 생성했습니다.")
         return copies
 
-    def persist(self):
-        """모든 데이터를 JSON 파일로 저장합니다."""
-        _write_json(self._members_file, [asdict(m) for m in self.members])
-        _write_json(self._loans_file, [asdict(l) for l in self.loans])
-        _write_json(self._works_file, [asdict(w) for w in self.works])
-        _write_json(self._copies_file, [asdict(c) for c in self.copies])
-        _write_json(self._deleted_works_file, [asdict(w) for w in self.deleted_works])
+    @staticmethod
+    def _copies_from_frame(df, works: List[Work]) -> List[Copy]:
+        """도서마다 엑셀 책개수만큼 복본을 만듭니다. 복본 ID는 전체에 걸쳐 1부터 순서대로 부여합니다."""
+        pd = _pandas()
+        counts = Repository._copy_counts(df, works)
+        # 도서마다 책개수만큼 행을 펼침
+        work_ids = pd.Series([w.work_id for w in works], dtype="int64").repeat(counts)
+        dates = pd.Series([w.registered_date for w in works], dtype=object).repeat(counts)
+        return list(starmap(Copy, zip(
+            range(1, len(work_ids) + 1),
+            work_ids.tolist(),
+            ["available"] * len(work_ids),
+            dates.tolist(),
+        )))
+
+    @staticmethod
+    def _copy_counts(df, works: List[Work]) -> List[int]:
+        """도서별 복본 수. work_id - 1 번째 엑셀 행의 책개수를 쓰고, 없거나 숫자가 아니면 1, 음수면 0입니다.
+
+        데이터프레임이 없거나 책개수 열이 없으면 모든 도서가 1개입니다.
+        """
+        pd = _pandas()
+        if df is None or '책개수' not in df.columns:
+            return [1] * len(works)
+        per_row = pd.to_numeric(df['책개수'], errors='coerce').reset_index(drop=True)
+        # 엑셀 범위를 벗어난 도서는 reindex에서 NaN이 되어 기본값 1
+        counts = per_row.reindex([w.work_id - 1 for w in works])
+        counts = counts.where(counts.abs() != float("inf")).fillna(1)
+        return counts.astype("int64").clip(lower=0).tolist()
+
+    # ---- 색인 ----
+    def get(self, collection: str, key):
+        """기본키로 레코드를 찾습니다 (없으면 None)."""
+        return self._index(collection).by_pk.get(key)
+
+    @property
+    def deleted_work_ids(self):
+        """삭제된 도서 ID 집합 (deleted_works 기본키 색인의 키 뷰라 add/remove와 함께 바뀜)."""
+        return self._index("deleted_works").by_pk.keys()
+
+    def find_work(self, title: str, author_key: str) -> Optional[Work]:
+        """제목과 저자키가 같은 (삭제되지 않은) 도서를 찾습니다."""
+        group = self._index("works").by_title_author.get((title, author_key), {})
+        return next((w for w in group.values() if w.deleted_date is None), None)
+
+    def member_by_phone(self, phone: str) -> Optional[Member]:
+        """연락처로 회원을 찾습니다."""
+        group = self._index("members").by_phone.get(phone)
+        return next(iter(group.values())) if group else None
+
+    def copies_of(self, work_id: int) -> List[Copy]:
+        """도서의 복본 목록 (삭제된 복본 포함, 리스트 순서)."""
+        return list(self._index("copies").by_work.get(work_id, {}).values())
+
+    def available_copy(self, work_id: int) -> Optional[Copy]:
+        """도서의 대출 가능 복본을 찾습니다 (삭제된 복본 제외).
+
+        저장소가 직접 조회할 수 있으면 그 인덱스로 한 행만 찾고, 아니면 메모리 풀에서 O(1)로 찾습니다.
+        """
+        keys = self._stored_keys("copies", {"work_id": work_id, "status": "available", "deleted_date": None})
+        if keys is not None:
+            return self._index("copies").by_pk.get(keys[0]) if keys else None
+        return self._index("copies").next_free(work_id)
+
+    def fetch(self, collection: str, key):
+        """기본키로 레코드 하나를 찾습니다. get()과 같지만 저장소가 직접 조회할 수 있으면 그쪽에서 찾습니다.
+
+        대출·반납처럼 한 건만 찾는 곳에서 쓰고, 반복문에서는 get()을 씁니다.
+        """
+        keys = self._stored_keys(collection, {COLLECTIONS[collection][1]: key})
+        if keys is None:
+            return self.get(collection, key)
+        return self._index(collection).by_pk.get(keys[0]) if keys else None
+
+    def open_loan(self, copy_id: int) -> Optional[Loan]:
+        """복본의 미반납 대출 하나 (없으면 None). 저장소가 직접 조회할 수 있으면 그쪽에서 찾습니다."""
+        keys = self._stored_keys("loans", {"copy_id": copy_id, "return_date": None})
+        if keys is None:
+            return next(iter(self.open_loans(copy_id=copy_id)), None)
+        return self._index("loans").by_pk.get(keys[0]) if keys else None
+
+    def _stored_keys(self, collection: str, where: dict) -> Optional[list]:
+        """저장소 인덱스로 조건에 맞는 첫 레코드의 기본키를 찾습니다.
+
+        찾은 키의 객체는 메모리 색인에서 꺼내므로 서비스는 지금처럼 객체를 고치고 touch()합니다.
+        저장소가 직접 조회할 수 없거나 아직 기록되지 않은 변경이 있으면 None입니다.
+        """
+        with self._lock:  # 기록 스레드와 같은 연결을 쓰므로 잠금 안에서 조회
+            if self._dirty or self.persist_stats.queue_depth:
+                return None
+            return self.storage.find(collection, where)
+
+    def copy_counts(self, work_id: int):
+        """도서의 (대출 가능 복본 수, 전체 복본 수)."""
+        index = self._index("copies")
+        return index.available[work_id], len(index.by_work.get(work_id, ()))
+
+    def open_loans(self, copy_id: Optional[int] = None, student_id: Optional[str] = None,
+                   work_id: Optional[int] = None) -> List[Loan]:
+        """복본, 회원 또는 도서(하나만 지정)의 미반납 대출 목록."""
+        index = self._index("loans")
+        if copy_id is not None:
+            group = index.open_by_copy.get(copy_id)
+        elif student_id is not None:
+            group = index.open_by_member.get(student_id)
+        else:
+            group = index.open_by_work.get(work_id)
+        return list(group.values()) if group else []
+
+    def member_loans(self, student_id: str) -> List[Loan]:
+        """회원의 전체 대출 기록 (보관된 대출 포함, loan_history()와 같은 순서)."""
+        hot = list(self._index("loans").by_member.get(student_id, {}).values())
+        archived, by_member = self._archived_by_member
+        if archived is not self.archived_loans():
+            archived = self.archived_loans()
+            by_member = {}
+            for l in archived:
+                by_member.setdefault(l.student_id, []).append(l)
+            self._archived_by_member = (archived, by_member)
+        cold = [l for l in by_member.get(student_id, ()) if self.get("loans", l.loan_id) is None]
+        return cold + hot
+
+    def _index(self, collection: str) -> CollectionIndex:
+        """컬렉션 색인을 반환합니다. 리스트가 교체되었거나(다시 로드, 보관) 직접 바뀌었으면 다시 만듭니다."""
+        items = getattr(self, collection)
+        index = self._indexes.get(collection)
+        if index is None or index.items is not items or index.size != len(items):
+            index_type = INDEX_TYPES.get(collection, CollectionIndex)
+            index = self._indexes[collection] = index_type(items, COLLECTIONS[collection][1])
+        return index
+
+    # ---- 변경 기록 ----
+    def add(self, collection: str, obj):
+        """컬렉션에 레코드를 추가하고 변경을 기록합니다."""
+        index = self._index(collection)
+        index.items.append(obj)
+        index.add(obj)
+        self._record("put", collection, obj)
+
+    def remove(self, collection: str, obj):
+        """컬렉션에서 레코드를 제거하고 변경을 기록합니다."""
+        index = self._index(collection)
+        index.items.remove(obj)
+        index.remove(obj)
+        self._record("del", collection, obj)
+
+    def touch(self, collection: str, obj):
+        """이미 컬렉션에 있는 레코드가 수정되었음을 기록합니다."""
+        self._index(collection).update(obj)
+        self._record("put", collection, obj)
+
+    def mark_dirty(self, *collections: str):
+        """다음 persist()에서 다시 저장할 컬렉션을 표시합니다.
+
+        리스트를 직접 바꾼 경우이므로 변경 레코드로는 표현되지 않아 다음 기록은 체크포인트가 됩니다.
+        """
+        with self._lock:
+            self._dirty.update(collections or COLLECTIONS)
+            self._checkpoint_due = True
+            for name in collections or COLLECTIONS:
+                self._indexes.pop(name, None)
+
+    def _record(self, op: str, collection: str, obj):
+        # 기록 스레드가 기록 중일 수 있으므로 잠금 안에서 변경을 쌓음
+        with self._lock:
+            self._dirty.add(collection)
+            if not self._log_changes:
+                return
+            if op == "put":
+                self._pending.append({"op": "put", "c": collection, "v": dict(vars(obj))})
+            else:
+                pk = COLLECTIONS[collection][1]
+                self._pending.append({"op": "del", "c": collection, "k": getattr(obj, pk)})
+
+    def _replay(self, records) -> int:
+        """변경 레코드를 순서대로 적용하고 적용한 레코드 수를 반환합니다."""
+        positions = {}  # 컬렉션별 기본키 -> 리스트 위치
+        compact = set()
+        count = 0
+        for rec in records:
+            name = rec["c"]
+            self._dirty.add(name)
+            cls, pk = COLLECTIONS[name]
+            items = getattr(self, name)
+            pos = positions.get(name)
+            if pos is None:
+                pos = positions[name] = {getattr(o, pk): i for i, o in enumerate(items)}
+            if rec["op"] == "put":
+                obj = cls(**rec["v"])
+                i = pos.get(getattr(obj, pk))
+                if i is None:
+                    pos[getattr(obj, pk)] = len(items)
+                    items.append(obj)
+                else:
+                    items[i] = obj
+            else:
+                i = pos.pop(rec["k"], None)
+                if i is not None:
+                    items[i] = None
+                    compact.add(name)
+            count += 1
+        for name in compact:
+            setattr(self, name, [o for o in getattr(self, name) if o is not None])
+        for name in positions:
+            self._indexes.pop(name, None)  # 같은 자리의 레코드가 교체되었을 수 있음
+        return count
+
+    # ---- 여러 프로세스 공유 ----
+    @contextlib.contextmanager
+    def transaction(self):
+        """읽기-수정-쓰기를 다른 프로세스와 겹치지 않게 수행합니다.
+
+        공유 모드에서는 데이터 디렉터리 잠금을 잡고 다른 프로세스가 커밋한 컬렉션을
+        다시 읽은 뒤 본문을 실행하며, 잠금을 풀기 전에 변경을 기록합니다 (재진입 가능).
+        """
+        with self._lock:
+            if not self.shared or self._in_transaction:
+                yield
+                return
+            with self.storage.lock():
+                self._in_transaction = True
+                try:
+                    self._refresh()
+                    yield
+                    # 기록 스레드를 기다리지 않고 잠금 안에서 기록
+                    if self._pending or self._checkpoint_due or self.persist_stats.queue_depth:
+                        self._write(False)
+                finally:
+                    self._in_transaction = False
+
+    def refresh(self) -> bool:
+        """다른 프로세스가 커밋한 변경을 반영하고, 다시 읽은 컬렉션이 있으면 True를 반환합니다."""
+        if not self.shared:
+            return False
+        with self._lock, self.storage.lock():
+            return self._refresh()
+
+    def _refresh(self) -> bool:
+        """버전이 바뀐 컬렉션을 다시 읽고, 아직 기록하지 않은 이 프로세스의 변경을 그 위에 다시 적용합니다."""
+        current = self.storage.versions()
+        stale = {name for name in COLLECTIONS if current.get(name, 0) != self._versions.get(name, 0)}
+        self._versions = current
+        if not stale:
+            return False
+        for name in stale:
+            setattr(self, name, self._load_members() if name == "members"
+                    else self.storage.load(name, COLLECTIONS[name][0]) or [])
+        self._dirty -= stale
+        self._replay(r for r in self.storage.replay() if r["c"] in stale)
+        self._replay(r for r in self._pending if r["c"] in stale)
+        self._archived = None
+        self.reloads += 1
+        return True
+
+    def _stamp(self, names):
+        """공유 모드에서 기록한 컬렉션의 버전을 올려 다른 프로세스에 알립니다."""
+        if self.shared and names:
+            self._versions = self.storage.bump(names)
+
+    # ---- 저장 ----
+    def persist(self, full: bool = False):
+        """변경 사항을 저장합니다. 저널 모드에서는 변경 레코드만 로그에 덧붙입니다.
+
+        full=True이면 변경 여부와 관계없이 모든 컬렉션을 다시 저장합니다.
+        기록 스레드가 있으면 요청을 쌓고, 기록 스레드가 group_commit_ms 창 안의 변경을
+        한 번에 기록합니다. 그룹 커밋이면 그 기록이 끝날 때까지 기다렸다가 반환하고,
+        백그라운드 기록이면 곧바로 반환합니다 (종료 전 flush() 필요).
+        """
+        if self._writer is not None and not full:
+            with self._lock:
+                stats = self.persist_stats
+                if stats.queue_depth == 0:
+                    self._queued_at = time.perf_counter()
+                stats.queue_depth += 1
+                stats.max_queue_depth = max(stats.max_queue_depth, stats.queue_depth)
+                self._wake.notify_all()
+                if self._background or self._in_transaction:
+                    return  # 공유 모드 트랜잭션은 잠금을 풀기 전에 직접 기록
+                if self._write_error is not None:
+                    self.flush()  # 기록 스레드가 멈춰 있으므로 직접 기록 (여전히 실패하면 예외)
+                    return
+                # 그룹 커밋: 요청 뒤에 끝난 기록에는 이 변경이 포함되어 있음
+                ticket = self._write_seq
+                while self._write_seq == ticket:
+                    if self._write_error is not None:
+                        raise self._write_error
+                    self._wake.wait()
+            return
+        with self._lock:
+            self._commit(full)
+
+    def flush(self):
+        """기록 스레드가 아직 쓰지 않은 변경이 있으면 호출한 스레드에서 즉시 기록합니다.
+
+        기록에 실패하면 예외가 발생합니다. 기록 스레드가 실패를 거듭해 멈춰 있었다면
+        여기서 다시 기록을 시도하고, 성공하면 기록 스레드도 다시 동작합니다.
+        """
+        with self._lock:
+            if self.persist_stats.queue_depth:
+                self._commit(False)
+            self._write_error = None
+            self._wake.notify_all()
+
+    def _writer_loop(self):
+        """백그라운드 기록 스레드: 요청이 들어오면 group_commit_ms 동안 더 모은 뒤 한 번에 기록합니다."""
+        failures = 0
+        retry_at = 0.0
+        with self._lock:
+            while True:
+                while not self._closing and (not self.persist_stats.queue_depth or self._write_error is not None):
+                    self._wake.wait()  # persist()가 깨움 (재시도를 멈춘 뒤에는 flush()가 깨움)
+                if self._closing:
+                    return  # 남은 변경은 close()가 flush()로 기록
+                # 기다리는 동안에는 잠금을 놓으므로 다른 스레드의 작업이 막히지 않음
+                deadline = max(self._queued_at + self.group_commit_ms / 1000, retry_at)
+                while not self._closing:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._wake.wait(remaining)
+                if not self.persist_stats.queue_depth or self._write_error is not None:
+                    continue  # 기다리는 동안 flush()가 기록함
+                try:
+                    self._commit(False)
+                except Exception as e:
+                    # 변경은 메모리에 남아 있으므로 잠시 뒤 다시 시도하고, 계속 실패하면 멈춤
+                    failures += 1
+                    print(f"백그라운드 저장 중 오류 ({failures}/{WRITE_RETRY_LIMIT}회): {e}")
+                    if failures >= WRITE_RETRY_LIMIT:
+                        self._write_error = e
+                        self._wake.notify_all()  # 그룹 커밋으로 기다리는 persist()에 오류를 알림
+                        failures, retry_at = 0, 0.0
+                    else:
+                        retry_at = time.perf_counter() + WRITE_RETRY_DELAY_S * 2 ** (failures - 1)
+                else:
+                    failures, retry_at = 0, 0.0
+
+    def _commit(self, full: bool):
+        if self.shared:
+            # 잠금 안에서 다른 프로세스의 커밋을 먼저 반영한 뒤 기록
+            with self.transaction():
+                self._write(full)
+        else:
+            self._write(full)
+
+    def _write(self, full: bool):
+        start = time.perf_counter()
+        self.persist_stats.last_files = 0
+        self.persist_stats.last_bytes = 0
+        if full or self._checkpoint_due or not (self.journal or self.storage.appends_in_place):
+            self.checkpoint(full)
+        else:
+            if self._pending:
+                self._count_write(self.storage.append(self._pending))
+                self._journal_count += len(self._pending)
+                self._stamp({r["c"] for r in self._pending})
+                self._pending = []
+            if self.storage.appends_in_place:
+                self._dirty.clear()  # 저장소에 행 단위로 이미 반영됨
+            elif self._journal_count >= self.checkpoint_every:
+                self.checkpoint()
+        stats = self.persist_stats
+        stats.calls += 1
+        end = time.perf_counter()
+        stats.last_write_ms = (end - start) * 1000
+        stats.max_write_ms = max(stats.max_write_ms, stats.last_write_ms)
+        if stats.queue_depth:
+            stats.last_lag_ms = (end - self._queued_at) * 1000
+            stats.queue_depth = 0
+        self._write_seq += 1
+        self._wake.notify_all()  # 그룹 커밋으로 기다리는 persist() 호출을 깨움
+
+    def checkpoint(self, full: bool = False):
+        """변경된(full이면 모든) 컬렉션을 저장소에 저장하고 변경 기록을 비웁니다."""
+        with self._lock:
+            files_before = self.persist_stats.files
+            saved = [name for name in COLLECTIONS if full or name in self._dirty]
+            for name in saved:
+                nbytes = self.storage.save(name, getattr(self, name))
+                if nbytes is None:
+                    self.persist_stats.skipped += 1
+                else:
+                    self._count_write(nbytes)
+            self._dirty.clear()
+            changed = full or self.persist_stats.files != files_before
+            nbytes = self.storage.saved({name: getattr(self, name) for name in COLLECTIONS}, changed)
+            if nbytes:
+                self._count_write(nbytes)
+            self._stamp(saved)
+            self._pending = []
+            self._journal_count = 0
+            self._checkpoint_due = False
+            self.storage.truncate_log()
+
+    def _count_write(self, nbytes: int):
+        stats = self.persist_stats
+        stats.files += 1
+        stats.bytes += nbytes
+        stats.last_files += 1
+        stats.last_bytes += nbytes
+
+    # ---- 대출 보관 (hot/cold 분리) ----
+    ARCHIVE_INDEX = f"{ARCHIVE_DIR}/index"
+    ARCHIVE_SEGMENT = f"{ARCHIVE_DIR}/loans-"
+
+    @property
+    def archive_max_loan_id(self) -> int:
+        """보관된 대출 중 가장 큰 loan_id (없으면 0)."""
+        return self.storage.load_doc(self.ARCHIVE_INDEX).get("max_loan_id", 0)
+
+    def archive_loans(self, today: date) -> int:
+        """반납일이 today - archive_days 이전인 대출을 월별 세그먼트로 옮기고 옮긴 건수를 반환합니다."""
+        if self.archive_days is None:
+            return 0
+        cutoff = date_str(today - timedelta(days=self.archive_days))
+        with self.transaction():
+            hot, cold = [], {}
+            for l in self.loans:
+                if l.return_date is not None and l.return_date < cutoff:
+                    cold.setdefault(l.return_date[:7], []).append(l)
+                else:
+                    hot.append(l)
+            if not cold:
+                return 0
+
+            # 세그먼트를 먼저 기록하고 loans를 줄임: 중간에 중단되면 양쪽에 남고, 조회 시 중복 제거
+            moved = 0
+            max_loan_id = self.archive_max_loan_id
+            for month, loans in cold.items():
+                segment = self.ARCHIVE_SEGMENT + month
+                merged = {l.loan_id: l for l in self.storage.load(segment, Loan) or []}
+                merged.update((l.loan_id, l) for l in loans)
+                nbytes = self.storage.save(segment, sorted(merged.values(), key=lambda l: l.loan_id))
+                self._count_write(nbytes or 0)
+                max_loan_id = max(max_loan_id, max(l.loan_id for l in loans))
+                moved += len(loans)
+            self._count_write(self.storage.save_doc(self.ARCHIVE_INDEX, {"max_loan_id": max_loan_id}))
+
+            self.loans = hot
+            self._archived = None
+            self.mark_dirty("loans")
+            self.checkpoint()  # 저널에 남은 예전 대출 기록이 다시 살아나지 않도록 체크포인트
+        print(f"반납 후 {self.archive_days}일이 지난 대출 {moved}건을 보관했습니다.")
+        return moved
+
+    def archived_loans(self) -> List[Loan]:
+        """보관된 대출을 (처음 호출될 때) 세그먼트에서 읽어 loan_id 순으로 반환합니다."""
+        if self._archived is None:
+            archived = []
+            for segment in self.storage.names(self.ARCHIVE_SEGMENT):
+                archived.extend(self.storage.load(segment, Loan) or [])
+            archived.sort(key=lambda l: l.loan_id)
+            self._archived = archived
+        return self._archived
+
+    def loan_history(self) -> List[Loan]:
+        """보관된 대출과 작업 중인 대출을 합친 전체 대출 기록."""
+        if not self.archived_loans():
+            return self.loans
+        hot_ids = {l.loan_id for l in self.loans}
+        return [l for l in self.archived_loans() if l.loan_id not in hot_ids] + self.loans
+
+    def close(self):
+        """기록 스레드를 멈추고 대기 중인 변경을 기록한 뒤 저장소를 닫습니다. 기록에 실패하면 예외가 발생합니다."""
+        if self._writer is not None:
+            with self._lock:
+                self._closing = True
+                self._wake.notify_all()
+            self._writer.join()
+            self._writer = None
+        try:
+            self.flush()  # 기록에 실패하면 저장소를 닫은 뒤 예외로 알림
+        finally:
+            self.storage.close()
 
 # -------------------- 서비스 로직 --------------------
 
+def _transactional(method):
+    """서비스 메서드를 저장소 트랜잭션 안에서 실행합니다 (공유 모드에서 최신 데이터 기준으로 검사·수정)."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.repo.transaction():
+            if self.repo.reloads != self._reloads_seen:
+                # 다른 프로세스가 추가한 레코드와 ID가 겹치지 않도록 다시 계산
+                self._init_id_counters()
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class LibraryService:
     def __init__(self, repo: Repository, today: date):
         self.repo = repo
         self.today = today
+        with self.repo.transaction():
+            self._init_id_counters()
+
+            # 데이터 정합성 검사 및 수정
+            self._validate_and_fix_data_integrity()
+
+            # 오래전에 반납된 대출은 작업 집합에서 보관 세그먼트로 이동
+            self.repo.archive_loans(self.today)
+
+    def _init_id_counters(self):
         # ID 생성기: 현재 최대값+1 (고유성 보장)
+        repo = self.repo
         self._next_work_id = self._get_next_unique_id([w.work_id for w in repo.works])
         self._next_copy_id = self._get_next_unique_id([c.copy_id for c in repo.copies])
-        self._next_loan_id = self._get_next_unique_id([l.loan_id for l in repo.loans])
-        
-        # 데이터 정합성 검사 및 수정
-        self._validate_and_fix_data_integrity()
+        self._next_loan_id = max(self._get_next_unique_id([l.loan_id for l in repo.loans]),
+                                 repo.archive_max_loan_id + 1)
+        self._reloads_seen = repo.reloads
 
     # ---- 데이터 무결성 검사 ----
     def _get_next_unique_id(self, existing_ids):
@@ -307,7 +1996,7 @@ class LibraryService:
 
     def _fix_deleted_work_references(self):
         """삭제된 work를 참조하는 copy를 정리합니다."""
-        deleted_work_ids = {w.work_id for w in self.repo.deleted_works}
+        deleted_work_ids = self.repo.deleted_work_ids
         fixed_count = 0
         
         for copy in self.repo.copies:
@@ -315,6 +2004,7 @@ class LibraryService:
                 copy.deleted_date = date_str(self.today)
                 if copy.status == "available":
                     copy.status = "deleted"
+                self.repo.touch("copies", copy)
                 fixed_count += 1
         
         if fixed_count > 0:
@@ -329,17 +2019,17 @@ class LibraryService:
         # 무효한 work_id를 참조하는 copy 제거
         invalid_copies = [c for c in self.repo.copies if c.work_id not in valid_work_ids]
         for copy in invalid_copies:
-            self.repo.copies.remove(copy)
+            self.repo.remove("copies", copy)
         
         # 무효한 student_id를 참조하는 loan 제거
         invalid_loans = [l for l in self.repo.loans if l.student_id not in valid_student_ids]
         for loan in invalid_loans:
-            self.repo.loans.remove(loan)
+            self.repo.remove("loans", loan)
         
         # 무효한 copy_id를 참조하는 loan 제거
         invalid_loans = [l for l in self.repo.loans if l.copy_id not in valid_copy_ids]
         for loan in invalid_loans:
-            self.repo.loans.remove(loan)
+            self.repo.remove("loans", loan)
         
         if invalid_copies or invalid_loans:
             print(f"무효한 참조 {len(invalid_copies + invalid_loans)}개를 제거했습니다.")
@@ -361,6 +2051,7 @@ class LibraryService:
                 loans.sort(key=lambda x: x.loan_date, reverse=True)
                 for loan in loans[1:]:  # 첫 번째(가장 최근) 제외
                     loan.return_date = loan.loan_date  # 대출일과 같은 날 반납 처리
+                    self.repo.touch("loans", loan)
                     fixed_count += 1
         
         if fixed_count > 0:
@@ -371,12 +2062,14 @@ class LibraryService:
         fixed_count = 0
         
         for loan in self.repo.loans:
+            changed = False
             # due_date = loan_date + 14일 검증
             expected_due_date = parse_date(loan.loan_date) + timedelta(days=DUE_DAYS)
             actual_due_date = parse_date(loan.due_date)
             
             if actual_due_date != expected_due_date:
                 loan.due_date = date_str(expected_due_date)
+                changed = True
                 fixed_count += 1
             
             # return_date가 있으면 loan_date ≤ return_date 검증
@@ -385,23 +2078,27 @@ class LibraryService:
                 return_date = parse_date(loan.return_date)
                 if return_date < loan_date:
                     loan.return_date = loan.loan_date  # 대출일과 같은 날로 수정
+                    changed = True
                     fixed_count += 1
+
+            if changed:
+                self.repo.touch("loans", loan)
         
         if fixed_count > 0:
             print(f"날짜 논리 오류 {fixed_count}개를 수정했습니다.")
 
     def _validate_fk(self, work_id: int = None, student_id: str = None, copy_id: int = None):
-        """참조 무결성을 검사합니다."""
+        """참조 무결성을 검사합니다 (단건 조회이므로 저장소가 직접 조회할 수 있으면 그쪽에서 찾음)."""
         if work_id is not None:
-            if not any(w.work_id == work_id for w in self.repo.works):
+            if self.repo.fetch("works", work_id) is None:
                 raise ValueError(f"존재하지 않는 work_id: {work_id}")
         
         if student_id is not None:
-            if not any(m.student_id == student_id for m in self.repo.members):
+            if self.repo.fetch("members", student_id) is None:
                 raise ValueError(f"존재하지 않는 student_id: {student_id}")
         
         if copy_id is not None:
-            if not any(c.copy_id == copy_id for c in self.repo.copies):
+            if self.repo.fetch("copies", copy_id) is None:
                 raise ValueError(f"존재하지 않는 copy_id: {copy_id}")
      
 
@@ -462,6 +2159,7 @@ class LibraryService:
         print(f"가상의 오늘 날짜가 {self.today} 로 설정되었습니다.")
 
     # ---- 도서/복본 관리 ----
+    @_transactional
     def add_work(self, title: str, author_display: str, copies: int = 1):
         # 입력값 검증
         if not title or not title.strip():
@@ -476,9 +2174,8 @@ class LibraryService:
         
         author_key = norm_author_key(author_display)
         # 동일 도서(제목+저자키) 존재 여부 확인
-        existing = [w for w in self.repo.works if w.title == title.strip() and w.author_key == author_key and w.deleted_date is None]
-        if existing:
-            work = existing[0]
+        work = self.repo.find_work(title.strip(), author_key)
+        if work:
             print(f"기존 도서에 복본 {copies}권 추가: work_id={work.work_id}")
         else:
             work = Work(
@@ -489,7 +2186,7 @@ class LibraryService:
                 registered_date=date_str(self.today),
                 deleted_date=None,
             )
-            self.repo.works.append(work)
+            self.repo.add("works", work)
             self._next_work_id += 1
             print(f"도서 등록 완료: work_id={work.work_id}")
         
@@ -500,7 +2197,7 @@ class LibraryService:
             print(f"오류: {e}")
             # work를 다시 제거
             if work in self.repo.works:
-                self.repo.works.remove(work)
+                self.repo.remove("works", work)
             return
         
         for _ in range(max(1, int(copies))):
@@ -511,10 +2208,75 @@ class LibraryService:
                 registered_date=date_str(self.today),
                 deleted_date=None,
             )
-            self.repo.copies.append(cp)
+            self.repo.add("copies", cp)
             self._next_copy_id += 1
         self.repo.persist()
 
+    def import_excel(self, path: Optional[str] = None):
+        """갱신된 엑셀(또는 CSV/Parquet 카탈로그)을 현재 도서에 병합합니다."""
+        path = path or self.repo.catalog
+        if not os.path.exists(path):
+            print(f"엑셀 파일을 찾을 수 없습니다: {path}")
+            return
+        try:
+            rows, counts = self.repo.read_excel_catalog(path)
+        except Exception as e:
+            print(f"엑셀 파일 로드 중 오류: {e}")
+            return
+        self._merge_catalog(rows, counts, "엑셀 가져오기")
+
+    def import_catalogs(self, paths: List[str], workers: Optional[int] = None):
+        """여러 카탈로그 파일(엑셀/CSV)을 병렬로 읽어 한 번에 병합합니다."""
+        missing = [p for p in paths if not os.path.exists(p)]
+        if missing:
+            print(f"카탈로그 파일을 찾을 수 없습니다: {', '.join(missing)}")
+            return
+        try:
+            rows, counts = read_catalogs(paths, workers)
+        except Exception as e:
+            print(f"카탈로그 파일 로드 중 오류: {e}")
+            return
+        self._merge_catalog(rows, counts, f"카탈로그 {len(paths)}개 가져오기")
+
+    @_transactional
+    def _merge_catalog(self, rows: List[Work], counts: List[int], label: str):
+        """읽어 온 도서 목록을 현재 도서에 병합하고 한 번만 저장합니다.
+
+        (제목, 저자키)가 같은 도서는 책개수보다 모자란 복본만 추가하고, 없는 도서는 새 ID로
+        추가합니다. 관리자가 삭제한 도서는 다시 추가하지 않으며, 기존 도서 ID와 대출 기록은
+        바꾸지 않습니다. 파일을 읽는 동안에는 잠그지 않고 병합할 때만 트랜잭션을 씁니다.
+        """
+        existing = {(w.title, w.author_key): w.work_id for w in self.repo.works if w.deleted_date is None}
+        deleted = {(w.title, w.author_key) for w in self.repo.works if w.deleted_date is not None}
+        copies_per_work = Counter(c.work_id for c in self.repo.copies if c.status != "deleted")
+        today = date_str(self.today)
+        new_works = new_copies = 0
+        for row, count in zip(rows, counts):
+            key = (row.title, row.author_key)
+            work_id = existing.get(key)
+            if work_id is None:
+                if key in deleted:
+                    continue
+                work = Work(self._next_work_id, row.title, row.author_key, row.author_display,
+                            row.registered_date)
+                self._next_work_id += 1
+                self.repo.add("works", work)
+                existing[key] = work_id = work.work_id
+                registered = work.registered_date
+                new_works += 1
+            else:
+                registered = today
+            for _ in range(count - copies_per_work[work_id]):
+                self.repo.add("copies", Copy(self._next_copy_id, work_id, "available", registered))
+                self._next_copy_id += 1
+                copies_per_work[work_id] += 1
+                new_copies += 1
+
+        if new_works or new_copies:
+            self.repo.persist()
+        print(f"{label} 완료: {len(rows)}행 중 신규 도서 {new_works}권, 추가 복본 {new_copies}개")
+
+    @_transactional
     def delete_work(self, work_id: int):
         work = self._find_work(work_id)
         if not work or work.deleted_date is not None:
@@ -522,7 +2284,7 @@ class LibraryService:
             return
 
       # 대출 중인 도서가 있는지 확인
-        active_loans = [l for l in self.repo.loans if l.work_id == work_id and l.return_date is None]
+        active_loans = self.repo.open_loans(work_id=work_id)
         if active_loans:
             print(f"대출 중인 도서가 {len(active_loans)}건 있어 삭제할 수 없습니다.")
             print("모든 대출이 반납된 후 삭제해주세요.")
@@ -530,27 +2292,28 @@ class LibraryService:
         
         # 삭제된 도서를 deleted_works에 추가
         work.deleted_date = date_str(self.today)
-        self.repo.deleted_works.append(work)
+        self.repo.touch("works", work)
+        self.repo.add("deleted_works", work)
         
         # 연결된 복본도 논리삭제
-        for c in self.repo.copies:
-            if c.work_id == work_id and c.deleted_date is None:
+        for c in self.repo.copies_of(work_id):
+            if c.deleted_date is None:
                 c.deleted_date = date_str(self.today)
                 if c.status == "available":
                     c.status = "deleted"
+                self.repo.touch("copies", c)
         
         self.repo.persist()
         print(f"도서(work_id={work_id}) 및 복본 논리삭제 완료")
 
+    @_transactional
     def list_works(self):
         rows = []
-        # 삭제된 도서 ID 목록 생성
-        deleted_work_ids = {w.work_id for w in self.repo.deleted_works}
+        deleted_work_ids = self.repo.deleted_work_ids
         
         for w in self.repo.works:
             if w.work_id not in deleted_work_ids:
-                copies_total = sum(1 for c in self.repo.copies if c.work_id == w.work_id and c.work_id not in deleted_work_ids)
-                copies_avail = sum(1 for c in self.repo.copies if c.work_id == w.work_id and c.work_id not in deleted_work_ids and c.status == "available")
+                copies_avail, copies_total = self.repo.copy_counts(w.work_id)
                 rows.append((w.work_id, w.title, w.author_display, copies_avail, copies_total))
         if not rows:
             print("등록된 도서가 없습니다.")
@@ -561,11 +2324,11 @@ class LibraryService:
         for r in rows:
             print(f"  {r[0]:>3} | {r[1]} | {r[2]} | {r[3]}/{r[4]}")
 
+    @_transactional
     def search_works(self, keyword: str):
         key = keyword.strip().lower()
         results = []
-        # 삭제된 도서 ID 목록 생성
-        deleted_work_ids = {w.work_id for w in self.repo.deleted_works}
+        deleted_work_ids = self.repo.deleted_work_ids
         
         for w in self.repo.works:
             if w.work_id not in deleted_work_ids:
@@ -578,29 +2341,25 @@ class LibraryService:
         print("work_id | 제목 | 저자 | 대출가능/총복본")
         print("-" * 100)
         for w in results:
-            copies_total = sum(1 for c in self.repo.copies if c.work_id == w.work_id and c.work_id not in deleted_work_ids)
-            copies_avail = sum(1 for c in self.repo.copies if c.work_id == w.work_id and c.work_id not in deleted_work_ids and c.status == "available")
+            copies_avail, copies_total = self.repo.copy_counts(w.work_id)
             print(f"  {w.work_id:>3} | {w.title} | {w.author_display} | {copies_avail}/{copies_total}")
 
-    def _find_work(self, work_id: int) -> Optional[Work]:
-        # 삭제된 도서 ID 목록 생성
-        deleted_work_ids = {w.work_id for w in self.repo.deleted_works}
+    def _find_work(self, work_id: int, fetch: bool = False) -> Optional[Work]:
+        """삭제되지 않은 도서를 찾습니다. fetch=True(대출·반납)이면 repo.fetch()로 한 건만 조회합니다."""
+        deleted_work_ids = self.repo.deleted_work_ids
         
-        for w in self.repo.works:
-            if w.work_id == work_id and w.work_id not in deleted_work_ids:
-                return w
+        w = self.repo.fetch("works", work_id) if fetch else self.repo.get("works", work_id)
+        if w is not None and w.work_id not in deleted_work_ids:
+            return w
         return None
 
     def _find_available_copy(self, work_id: int) -> Optional[Copy]:
-        # 삭제된 도서 ID 목록 생성
-        deleted_work_ids = {w.work_id for w in self.repo.deleted_works}
-        
-        for c in self.repo.copies:
-            if c.work_id == work_id and c.work_id not in deleted_work_ids and c.deleted_date is None and c.status == "available":
-                return c
-        return None
+        if work_id in self.repo.deleted_work_ids:
+            return None
+        return self.repo.available_copy(work_id)
 
     # ---- 회원 ----
+    @_transactional
     def register_member(self, student_id: str, name: str, phone: str, password: str):
         # 입력값 검증
         if not student_id or not student_id.strip():
@@ -640,17 +2399,17 @@ class LibraryService:
         
         
         # 중복 검사
-        if any(m.student_id == student_id for m in self.repo.members):
+        if self.repo.get("members", student_id) is not None:
             print("이미 등록된 학번입니다.")
             return
         
         # 연락처 중복 검사
-        if any(m.phone == phone for m in self.repo.members):
+        if self.repo.member_by_phone(phone) is not None:
             print("이미 등록된 연락처입니다.")
             return
         
         
-        self.repo.members.append(Member(
+        self.repo.add("members", Member(
             student_id=student_id, 
             name=name, 
             phone=phone, 
@@ -660,6 +2419,7 @@ class LibraryService:
         self.repo.persist()
         print("회원 등록 완료")
 
+    @_transactional
     def list_members(self):
         if not self.repo.members:
             print("등록된 회원이 없습니다.")
@@ -670,32 +2430,29 @@ class LibraryService:
         for m in self.repo.members:
             print(f"  {m.student_id} | {m.name} | {m.phone} | {m.registered_date}")
 
+    @_transactional
     def remove_member(self, student_id: str):
         """회원을 탈퇴시킵니다. 대출중인 도서가 있으면 탈퇴할 수 없습니다."""
         # 회원 존재 확인
-        member = None
-        for m in self.repo.members:
-            if m.student_id == student_id:
-                member = m
-                break
-        
+        member = self.repo.get("members", student_id)
         if not member:
             print("존재하지 않는 학번입니다.")
             return
         
         # 대출중인 도서 확인
-        active_loans = [l for l in self.repo.loans if l.student_id == student_id and l.return_date is None]
+        active_loans = self.repo.open_loans(student_id=student_id)
         if active_loans:
             print(f"대출중인 도서가 {len(active_loans)}권 있어 탈퇴할 수 없습니다.")
             print("대출중인 도서를 모두 반납한 후 탈퇴해주세요.")
             return
         
         # 회원 삭제
-        self.repo.members.remove(member)
+        self.repo.remove("members", member)
         self.repo.persist()
         print(f"회원 탈퇴 완료: {member.name} ({member.student_id})")
 
     # ---- 대출/반납 ----
+    @_transactional
     def loan(self, student_id: str, work_id: int):
         # 참조 무결성 검사 (FK 위반 시 완전히 금지)
         try:
@@ -706,11 +2463,11 @@ class LibraryService:
             return
         
         # 회원 확인
-        if not any(m.student_id == student_id for m in self.repo.members):
+        if self.repo.fetch("members", student_id) is None:
             print("회원이 아닙니다. 회원 등록 후 이용하세요.")
             return
         # 도서 확인
-        work = self._find_work(work_id)
+        work = self._find_work(work_id, fetch=True)
         if not work or work.deleted_date is not None:
             print("도서가 존재하지 않거나 삭제되었습니다.")
             return
@@ -721,7 +2478,7 @@ class LibraryService:
             return
         
         # 중복 대출 방지: 해당 복본이 이미 대출 중인지 확인
-        active_loan = next((l for l in self.repo.loans if l.copy_id == cp.copy_id and l.return_date is None), None)
+        active_loan = self.repo.open_loan(cp.copy_id)
         if active_loan:
             print("해당 복본은 이미 대출 중입니다.")
             return
@@ -735,6 +2492,7 @@ class LibraryService:
             return
         
         cp.status = "loaned"
+        self.repo.touch("copies", cp)
         loan = Loan(
             loan_id=self._next_loan_id,
             copy_id=cp.copy_id,
@@ -744,7 +2502,7 @@ class LibraryService:
             due_date=date_str(self.today + timedelta(days=DUE_DAYS)),
             return_date=None,
         )
-        self.repo.loans.append(loan)
+        self.repo.add("loans", loan)
         self._next_loan_id += 1
         self.repo.persist()
         
@@ -752,14 +2510,15 @@ class LibraryService:
         book_title = work.title
         print(f"대출 완료: loan_id={loan.loan_id}, 제목='{book_title}', 반납기한={loan.due_date}")
 
+    @_transactional
     def return_copy(self, loan_id: int):
-        loan = None
-        for l in self.repo.loans:
-            if l.loan_id == loan_id:
-                loan = l
-                break
+        loan = self.repo.fetch("loans", loan_id)
         if not loan:
-            print("해당 대출 기록이 없습니다.")
+            # 보관된 대출은 모두 반납이 끝난 기록
+            if any(l.loan_id == loan_id for l in self.repo.archived_loans()):
+                print("이미 반납 처리된 대출입니다.")
+            else:
+                print("해당 대출 기록이 없습니다.")
             return
         if loan.return_date is not None:
             print("이미 반납 처리된 대출입니다.")
@@ -774,17 +2533,19 @@ class LibraryService:
             return
         
         # 복본 상태 복구
-        cp = next((c for c in self.repo.copies if c.copy_id == loan.copy_id), None)
+        cp = self.repo.fetch("copies", loan.copy_id)
         if cp:
             # 삭제된 복본이라도 반납처리는 가능하지만 상태는 deleted 유지
             if cp.status == "loaned":
                 # 삭제되지 않은 경우만 available로 되돌림
                 cp.status = "available" if cp.deleted_date is None else cp.status
+                self.repo.touch("copies", cp)
         loan.return_date = date_str(self.today)
+        self.repo.touch("loans", loan)
         self.repo.persist()
         
         # 책 제목 가져오기
-        work = self._find_work(loan.work_id)
+        work = self._find_work(loan.work_id, fetch=True)
         book_title = work.title if work else "알 수 없음"
         
         overdue = parse_date(loan.return_date) > parse_date(loan.due_date)
@@ -793,9 +2554,11 @@ class LibraryService:
         else:
             print(f"반납 완료: loan_id={loan.loan_id}, 제목='{book_title}', 반납일={loan.return_date}")
 
+    @_transactional
     def list_loans(self, only_open: bool = False):
         rows = []
-        for l in self.repo.loans:
+        # 미반납만 볼 때는 작업 중인 대출만, 전체를 볼 때는 보관된 기록까지 조회
+        for l in (self.repo.loans if only_open else self.repo.loan_history()):
             if only_open and l.return_date is not None:
                 continue
             overdue = (l.return_date is None and self.today > parse_date(l.due_date))
@@ -818,15 +2581,62 @@ class LibraryService:
 
 # -------------------- 대화식 CLI --------------------
 
+def _process_elapsed_s() -> Optional[float]:
+    """프로세스가 시작된 뒤 지난 벽시계 시간(초)을 돌려줍니다. /proc가 없으면 None (Linux 전용, 10 ms 단위)."""
+    try:
+        with open("/proc/self/stat", "rb") as f:
+            stat = f.read()
+        # 두 번째 필드(실행 파일 이름)에 공백이 있을 수 있으므로 마지막 ')' 뒤부터 나눔. 22번째 필드가 starttime
+        start_ticks = int(stat.rsplit(b")", 1)[1].split()[19])
+        return time.clock_gettime(time.CLOCK_BOOTTIME) - start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, AttributeError, ValueError, IndexError):
+        return None
+
+
+@dataclass
+class StartupTiming:
+    """--timing: 시작 단계별 소요 시간 (ms)"""
+    import_ms: float = 0.0  # 프로세스 시작부터 모듈 임포트가 끝날 때까지 (벽시계 시간)
+    load_ms: float = 0.0  # 저장소 열기와 데이터 로드
+    integrity_ms: float = 0.0  # 서비스 생성: 정합성 검사와 대출 보관
+    first_menu_ms: float = 0.0  # CLI 실행부터 첫 메뉴 표시 직전까지
+
+    def report(self):
+        total = self.import_ms + self.load_ms + self.integrity_ms + self.first_menu_ms
+        print(f"[TIMING] 임포트 {self.import_ms:.1f} ms, 데이터 로드 {self.load_ms:.1f} ms, "
+              f"정합성 검사 {self.integrity_ms:.1f} ms, 첫 메뉴 {self.first_menu_ms:.1f} ms "
+              f"(합계 {total:.1f} ms)")
+
+
 class CLI:
-    def __init__(self, repo: Repository, today: date):
+    def __init__(self, repo: Repository, today: date, timing: Optional[StartupTiming] = None):
         self.repo = repo
+        started = time.perf_counter()
         self.service = LibraryService(self.repo, today)
         self.logged_in = None  # (role, id)  role: 'admin' or 'member'
+        self.timing = timing
+        if timing is not None:
+            timing.integrity_ms = (time.perf_counter() - started) * 1000
 
     def run(self):
+        self._started = time.perf_counter()
         print("==== 도서 대출 프로그램 (CLI) ====")
+        try:
+            self._run()
+        finally:
+            self.repo.flush()
+            stats = self.repo.persist_stats
+            if self.repo.background:
+                print(f"저장 통계: 기록 {stats.calls}회, 최대 대기 요청 {stats.max_queue_depth}개, "
+                      f"최대 기록 시간 {stats.max_write_ms:.1f} ms")
+
+    def _run(self):
         while True:
+            # 공유 모드: 다른 단말의 변경(회원 등록 등)을 메뉴마다 반영
+            self.repo.refresh()
+            if self.timing is not None and not self.timing.first_menu_ms:
+                self.timing.first_menu_ms = (time.perf_counter() - self._started) * 1000
+                self.timing.report()
             if not self.logged_in:
                 if not self._menu_welcome():
                     return  # 종료
@@ -854,12 +2664,8 @@ class CLI:
         if cmd == '1':
             student_id = input("학번: ").strip()
             password = input("비밀번호: ").strip()
-            member = None
-            for m in self.repo.members:
-                if m.student_id == student_id and m.password == password:
-                    member = m
-                    break
-            if member:
+            member = self.repo.get("members", student_id)
+            if member and member.password == password:
                 self.logged_in = ('member', member.student_id)
                 print(f"회원 로그인 완료: {member.name} ({member.student_id})")
             else:
@@ -923,6 +2729,7 @@ class CLI:
         print(" 8) 대출 현황(미반납만)")
         print(" 9) 오늘 날짜 변경")
         print("10) 로그아웃")
+        print("11) 엑셀 다시 가져오기(신규 도서·추가 복본)")
         print(" 0) 종료")
         try:
             cmd = input("선택: ").strip()
@@ -966,6 +2773,9 @@ class CLI:
         elif cmd == '10':
             self.logged_in = None
             print("로그아웃되었습니다.")
+        elif cmd == '11':
+            path = input(f"카탈로그 파일(기본: {self.repo.catalog}): ").strip() or self.repo.catalog
+            self.service.import_excel(path)
         elif cmd == '0':
             print("프로그램을 종료합니다.")
             return False
@@ -1009,7 +2819,7 @@ class CLI:
             self.service.return_copy(lid)
         elif cmd == '5':
             # 내 대출만 필터링
-            all_loans = [l for l in self.repo.loans if l.student_id == sid]
+            all_loans = self.repo.member_loans(sid)
             if not all_loans:
                 print("대출 기록이 없습니다.")
             else:
@@ -1077,9 +2887,460 @@ def run_selftest(repo: Repository, today: date):
     # 새 대출
     service.loan("20230002", 1)
     service.list_loans(only_open=True)
+
+    stats = repo.persist_stats
+    print(f"[SELFTEST] 저장 통계: persist {stats.calls}회, 파일 {stats.files}개, {stats.bytes} bytes "
+          f"(동일 내용 생략 {stats.skipped}개), 최대 기록 시간 {stats.max_write_ms:.1f} ms, "
+          f"최대 대기 요청 {stats.max_queue_depth}개")
     
+    # 파일을 쓰는 검증은 파일 저장소(--storage json/sqlite)를 고른 경우에만 (기본 메모리 저장소는 파일을 건드리지 않음)
+    if repo.data_dir is not None:
+        _selftest_journal_replay(today)
+        if fcntl is not None:
+            _selftest_shared_writers(today)
+
     print("[SELFTEST] 완료 — 출력 로그를 확인해 주세요.")
 
+
+def _selftest_journal_replay(today: date):
+    """저널 모드에서 체크포인트 없이 중단된 뒤 다시 열면 저널을 재생해 변경이 복구되는지 확인합니다."""
+    print("\n[SELFTEST] 저널 재생 검증 (체크포인트 없이 중단)")
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog = os.path.join(tmp, "none.xlsx")
+        with contextlib.redirect_stdout(io.StringIO()):
+            repo = Repository(tmp, journal=True, catalog=catalog)
+            service = LibraryService(repo, today)
+            service.add_work("Clean Code", "Robert C. Martin", 2)
+            service.register_member("202300001", "홍길동", "010-1111-2222", "password123")
+            service.loan("202300001", 1)
+            service.add_work("Refactoring", "Martin Fowler", 1)
+            service.delete_work(2)
+        expected = {name: [asdict(o) for o in getattr(repo, name)] for name in COLLECTIONS}
+        journal = os.path.join(tmp, JOURNAL_FILE)
+        records = sum(1 for _ in repo.storage.replay())
+        assert records, "체크포인트 없이 중단하려면 저널에 변경분이 남아 있어야 합니다"
+        # 중단 흉내: close()도 checkpoint()도 부르지 않고, 기록 도중 끊긴 마지막 줄을 남김
+        with open(journal, "ab") as f:
+            f.write(b'{"c":"loans","op":"add","d":{"loan_id"')
+        with contextlib.redirect_stdout(io.StringIO()):
+            reopened = Repository(tmp, journal=True, catalog=catalog)
+        actual = {name: [asdict(o) for o in getattr(reopened, name)] for name in COLLECTIONS}
+        reopened.close()
+    assert actual == expected, "저널 재생 뒤 데이터가 중단 직전과 다릅니다"
+    print(f"[SELFTEST] 저널 재생 통과: 변경 {records}건 복구, 끊긴 마지막 줄 무시")
+
+
+SHARED_SELFTEST_OPS = 20  # 공유 모드 검증에서 프로세스마다 등록할 회원·도서 수
+
+
+def _shared_selftest_worker(data_dir: str, catalog: str, today: date, worker: int, start):
+    """공유 모드 검증용 자식 프로세스: 회원과 도서를 등록하고 같은 도서를 대출합니다. 자식 프로세스에서 실행되므로 모듈 최상위에 둡니다."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        repo = Repository(data_dir, shared=True, catalog=catalog)
+        service = LibraryService(repo, today)
+        start.wait()  # 두 프로세스가 동시에 기록을 시작
+        for i in range(SHARED_SELFTEST_OPS):
+            student_id = f"2024{worker}{i:04d}"
+            service.register_member(student_id, "홍길동", f"010-{worker}{i:03d}-0000", "password123")
+            service.add_work(f"도서 {worker}-{i}", "저자", 1)
+            service.loan(student_id, 1)  # 모든 프로세스가 1번 도서의 복본을 두고 경쟁
+        repo.close()
+
+
+def _selftest_shared_writers(today: date):
+    """공유 모드에서 두 프로세스가 동시에 기록해도 변경이 유실되거나 ID가 겹치지 않는지 확인합니다."""
+    import multiprocessing  # 이 검증에서만 필요
+
+    print("\n[SELFTEST] 공유 모드 동시 기록 검증 (프로세스 2개)")
+    shared_copies = 5
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog = os.path.join(tmp, "none.xlsx")
+        with contextlib.redirect_stdout(io.StringIO()):
+            repo = Repository(tmp, shared=True, catalog=catalog)
+            LibraryService(repo, today).add_work("공유 도서", "저자", shared_copies)
+            repo.close()
+        start = multiprocessing.Event()
+        workers = [multiprocessing.Process(target=_shared_selftest_worker, args=(tmp, catalog, today, w, start))
+                   for w in range(2)]
+        for p in workers:
+            p.start()
+        start.set()
+        for p in workers:
+            p.join()
+        assert all(p.exitcode == 0 for p in workers), "공유 모드 검증 프로세스가 비정상 종료했습니다"
+        with contextlib.redirect_stdout(io.StringIO()):
+            repo = Repository(tmp, catalog=catalog)
+        ops = 2 * SHARED_SELFTEST_OPS
+        for name, pk in (("works", "work_id"), ("copies", "copy_id"), ("members", "student_id"), ("loans", "loan_id")):
+            ids = [getattr(o, pk) for o in getattr(repo, name)]
+            assert len(ids) == len(set(ids)), f"{name}: 중복된 ID가 있습니다"
+        assert len(repo.members) == ops, "유실된 회원 등록이 있습니다"
+        assert len(repo.works) == 1 + ops and len(repo.copies) == shared_copies + ops, "유실된 도서 등록이 있습니다"
+        loaned = [loan.copy_id for loan in repo.loans if loan.return_date is None]
+        assert len(loaned) == len(set(loaned)) == shared_copies, "한 복본이 두 번 대출되었거나 유실된 대출이 있습니다"
+        assert sum(c.status == "loaned" for c in repo.copies) == shared_copies, "복본 상태와 대출 기록이 다릅니다"
+        repo.close()
+    print(f"[SELFTEST] 공유 모드 통과: 회원·도서 {ops}건씩 유실 없음, ID 중복 없음, "
+          f"복본 {shared_copies}개에 대출 {ops}번 시도 중 {shared_copies}건 성공")
+
+# -------------------- 벤치마크 --------------------
+
+def _fill_synthetic(repo: Repository, n: int):
+    """대출 n건 규모의 가상 데이터(복본 n, 도서 n/4, 회원 n/20)를 채우고 전부 저장합니다."""
+    day = "2025-01-01"
+    n_works = max(1, n // 4)
+    n_members = max(1, n // 20)
+    repo.works = [Work(i, f"도서 {i}", f"저자 {i % 1000}", f"저자 {i % 1000}", day)
+                  for i in range(1, n_works + 1)]
+    repo.members = [Member(f"2024{i:05d}", "홍길동", f"010-{i // 10000:04d}-{i % 10000:04d}", "pw1234", day)
+                    for i in range(n_members)]
+    repo.copies = [Copy(i, (i - 1) % n_works + 1, "available", day) for i in range(1, n + 1)]
+    repo.deleted_works = []
+    repo.loans = []
+    for i in range(1, n + 1):
+        is_open = i % 10 == 0  # 10건 중 1건은 미반납
+        repo.loans.append(Loan(i, i, (i - 1) % n_works + 1, f"2024{i % n_members:05d}",
+                               "2025-01-02", "2025-01-16", None if is_open else "2025-01-10"))
+        if is_open:
+            repo.copies[i - 1].status = "loaned"
+    repo.persist(full=True)
+
+
+def _best_of(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _bench_startup(size: int):
+    """JSON 로드와 바이너리 스냅샷 로드의 저장소 시작 시간을 비교합니다."""
+    with tempfile.TemporaryDirectory() as tmp:
+        with contextlib.redirect_stdout(io.StringIO()):
+            _fill_synthetic(Repository(tmp, snapshot=True), size)
+        json_time = _best_of(lambda: Repository(tmp))
+        snapshot_time = _best_of(lambda: Repository(tmp, snapshot=True))
+        json_bytes = sum(os.path.getsize(os.path.join(tmp, f"{name}.json")) for name in COLLECTIONS)
+        snapshot_bytes = os.path.getsize(os.path.join(tmp, SNAPSHOT_FILE))
+    print(f"[BENCH] startup (대출 {size}건)")
+    print(f"  JSON     : {json_time * 1000:8.1f} ms  ({json_bytes:,} bytes)")
+    print(f"  스냅샷   : {snapshot_time * 1000:8.1f} ms  ({snapshot_bytes:,} bytes)")
+    print(f"  속도 향상: {json_time / snapshot_time:.1f}x")
+
+
+def _bench_write(size: int):
+    """레코드 size개짜리 loans 파일의 직렬화+기록 처리량을 형식별로 측정합니다."""
+    loans = [Loan(i, i, i // 4 + 1, f"2024{i % 50000:05d}", "2025-01-02", "2025-01-16",
+                  None if i % 10 == 0 else "2025-01-10") for i in range(1, size + 1)]
+    variants = [
+        ("asdict + indent=2 (기존)", lambda: _dump_json([asdict(l) for l in loans])),
+        ("pretty", lambda: _dump_json(_rows(loans))),
+        ("compact (json)", lambda: json.dumps(_rows(loans), ensure_ascii=False,
+                                              separators=(",", ":")).encode("utf-8")),
+    ]
+    if orjson is not None:
+        variants.append(("compact (orjson)", lambda: orjson.dumps(_rows(loans))))
+    print(f"[BENCH] write (레코드 {size:,}개)")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "loans.json")
+        for label, dump in variants:
+            nbytes = 0
+
+            def run():
+                nonlocal nbytes
+                nbytes = _write_bytes(path, dump())
+
+            elapsed = _best_of(run)
+            print(f"  {label:<24}: {elapsed * 1000:8.1f} ms  {nbytes / 1e6:7.1f} MB  "
+                  f"{size / elapsed / 1e6:5.2f} M레코드/s  {nbytes / 1e6 / elapsed:6.1f} MB/s")
+
+
+def _bench_service(size: int, ops: int = 200):
+    """LibraryService 대출·반납 처리량을 메모리 저장소, JSON 저널, 백그라운드 기록 JSON 저널에서 비교합니다."""
+    today = date(2025, 2, 1)
+
+    def run(open_repo) -> float:
+        with contextlib.redirect_stdout(io.StringIO()):
+            repo = open_repo()
+            _fill_synthetic(repo, size)
+            service = LibraryService(repo, today)
+            students = [m.student_id for m in repo.members]
+            start = time.perf_counter()
+            for i in range(ops):
+                loan_id = service._next_loan_id
+                service.loan(students[i % len(students)], i % len(repo.works) + 1)
+                service.return_copy(loan_id)
+            elapsed = time.perf_counter() - start  # 작업자가 기다린 시간 (종료 시 flush는 제외)
+            repo.close()
+        return elapsed
+
+    memory_time = run(lambda: Repository(storage=MemoryStorage()))
+    with tempfile.TemporaryDirectory() as tmp:
+        journal_time = run(lambda: Repository(tmp, journal=True))
+    with tempfile.TemporaryDirectory() as tmp:
+        background_time = run(lambda: Repository(tmp, journal=True, background=True))
+    print(f"[BENCH] service (대출 {size}건, 대출+반납 {ops}회)")
+    print(f"  메모리         : {memory_time * 1000:8.1f} ms  ({ops / memory_time:8.0f} 회/s)")
+    print(f"  JSON 저널      : {journal_time * 1000:8.1f} ms  ({ops / journal_time:8.0f} 회/s)")
+    print(f"  백그라운드 기록: {background_time * 1000:8.1f} ms  ({ops / background_time:8.0f} 회/s)")
+
+
+def _bench_list_works(size: int, sample: int = 50):
+    """도서 목록의 대출가능/총복본 계산을 복본 전체 스캔과 도서별 복본 색인으로 비교합니다.
+
+    스캔 방식은 도서 수 x 복본 수이므로 앞쪽 sample권만 재고 전체 도서 수로 환산합니다.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        repo = Repository(storage=MemoryStorage())
+        _fill_synthetic(repo, size)
+        service = LibraryService(repo, date(2025, 2, 1))
+
+    def scan(works):
+        return [(sum(1 for c in repo.copies if c.work_id == w.work_id and c.status == "available"),
+                 sum(1 for c in repo.copies if c.work_id == w.work_id)) for w in works]
+
+    head = repo.works[:sample]
+    assert scan(head) == [repo.copy_counts(w.work_id) for w in head]
+    scan_time = _best_of(lambda: scan(head), repeat=1) * len(repo.works) / len(head)
+    with contextlib.redirect_stdout(io.StringIO()):
+        index_time = _best_of(service.list_works)
+    print(f"[BENCH] list_works (도서 {len(repo.works):,}권, 복본 {len(repo.copies):,}개)")
+    print(f"  복본 스캔 (환산): {scan_time * 1000:10.1f} ms")
+    print(f"  복본 색인       : {index_time * 1000:10.1f} ms (출력 포함)")
+    print(f"  속도 향상       : {scan_time / index_time:.0f}x")
+
+
+def _bench_list_loans(size: int, deleted_every: int = 100):
+    """전체 대출 목록 출력을 _find_work가 호출마다 삭제 도서 집합을 새로 만들던 방식과 유지되는 집합으로 비교합니다."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        repo = Repository(storage=MemoryStorage())
+        _fill_synthetic(repo, size)
+        for work in repo.works[::deleted_every]:
+            work.deleted_date = "2025-01-20"
+            repo.deleted_works.append(work)
+        repo.mark_dirty("works", "deleted_works")
+        service = LibraryService(repo, date(2025, 2, 1))
+
+    def rebuilt_find_work(work_id):
+        deleted_work_ids = {w.work_id for w in repo.deleted_works}
+        w = repo.get("works", work_id)
+        return w if w is not None and w.work_id not in deleted_work_ids else None
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        index_time = _best_of(service.list_loans)
+        service._find_work = rebuilt_find_work
+        rebuild_time = _best_of(service.list_loans, repeat=1)
+    print(f"[BENCH] list_loans (대출 {len(repo.loans):,}건, 삭제 도서 {len(repo.deleted_works):,}권)")
+    print(f"  호출마다 집합 생성: {rebuild_time * 1000:8.1f} ms")
+    print(f"  유지되는 집합     : {index_time * 1000:8.1f} ms")
+    print(f"  속도 향상         : {rebuild_time / index_time:.1f}x")
+
+
+def _bench_loan(size: int, ops: int = 2000):
+    """복본 size*10개(기본 100만)에서 loan()의 복본 찾기를 전체 스캔과 도서별 대출 가능 복본 풀로 비교합니다."""
+    n_copies = size * 10
+    n_works = max(1, n_copies // 10)
+    day = "2025-01-01"
+    with contextlib.redirect_stdout(io.StringIO()):
+        repo = Repository(storage=MemoryStorage())
+        repo.works = [Work(i, f"도서 {i}", f"저자 {i % 1000}", f"저자 {i % 1000}", day)
+                      for i in range(1, n_works + 1)]
+        repo.copies = [Copy(i, (i - 1) // 10 + 1, "available", day) for i in range(1, n_copies + 1)]
+        repo.members = [Member(f"2024{i:05d}", "홍길동", f"010-0000-{i:04d}", "pw1234", day) for i in range(100)]
+        repo.deleted_works, repo.loans = [], []
+        repo.mark_dirty()
+        service = LibraryService(repo, date(2025, 2, 1))
+        # 첫 저장(전체 체크포인트)과 색인 생성은 한 번만 일어나므로 측정에서 제외
+        service.loan(repo.members[0].student_id, n_works)
+
+    def scan_copy(work_id):
+        deleted_work_ids = {w.work_id for w in repo.deleted_works}
+        for c in repo.copies:
+            if c.work_id == work_id and c.work_id not in deleted_work_ids and c.deleted_date is None \
+                    and c.status == "available":
+                return c
+        return None
+
+    def run(count: int, offset: int) -> float:
+        step = max(1, n_works // count)
+        start = time.perf_counter()
+        for i in range(count):
+            service.loan(repo.members[i % 100].student_id, (offset + i * step) % n_works + 1)
+        return (time.perf_counter() - start) / count
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        pool_time = run(ops, 0)
+        service._find_available_copy = scan_copy
+        scan_time = run(max(1, ops // 20), 1)
+    assert len(repo.loans) == 1 + ops + max(1, ops // 20)
+    print(f"[BENCH] loan (복본 {n_copies:,}개, 도서 {n_works:,}권)")
+    print(f"  전체 스캔 : {scan_time * 1e6:10.1f} us/건")
+    print(f"  복본 풀   : {pool_time * 1e6:10.1f} us/건")
+    print(f"  속도 향상 : {scan_time / pool_time:.0f}x")
+
+
+def _bench_register(size: int, ops: int = 2000):
+    """회원 일괄 등록에서 학번·연락처 중복 검사를 any() 스캔과 고유 색인으로 비교합니다.
+
+    양쪽 모두 같은 기존 회원을 대상으로 중복 검사만 재고, 그 뒤 실제 등록으로 결과를 확인합니다.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        repo = Repository(storage=MemoryStorage())
+        _fill_synthetic(repo, size)
+        service = LibraryService(repo, date(2025, 2, 1))
+    new = [(f"2025{i:05d}", f"011-{i // 10000:03d}-{i % 10000:04d}") for i in range(ops)]
+    members = repo.members
+    existing = len(members)
+
+    def scan():
+        return [any(m.student_id == student_id for m in members) or any(m.phone == phone for m in members)
+                for student_id, phone in new]
+
+    def indexed():
+        return [repo.get("members", student_id) is not None or repo.member_by_phone(phone) is not None
+                for student_id, phone in new]
+
+    assert scan() == indexed() == [False] * ops
+    scan_time = _best_of(scan, repeat=1)
+    index_time = _best_of(indexed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for student_id, phone in new:
+            service.register_member(student_id, "홍길동", phone, "pw1234")
+        service.register_member(new[0][0], "홍길동", "011-999-9999", "pw1234")  # 중복 학번은 거절
+    assert len(repo.members) == existing + ops and repo.member_by_phone(new[-1][1]) is not None
+    print(f"[BENCH] register (기존 회원 {existing:,}명, 신규 {ops:,}명, 중복 검사만)")
+    print(f"  any() 스캔: {scan_time * 1000:8.1f} ms")
+    print(f"  고유 색인 : {index_time * 1000:8.1f} ms")
+
+
+def _synthetic_excel_frame(rows: int):
+    """YES24 엑셀과 같은 열(제목, 저자, 등록일, 책개수)의 가상 데이터프레임."""
+    pd = _pandas()
+    return pd.DataFrame({
+        '제목': [f"도서 {i}" for i in range(rows)],
+        '저자': [f" 저자  {i % 1000} 외 " for i in range(rows)],
+        '등록일': ["2025-01-01"] * rows,
+        '책개수': [i % 5 + 1 for i in range(rows)],
+    })
+
+
+def _bench_excel(size: int):
+    """엑셀 데이터프레임 -> Work 변환을 iterrows 루프와 열 단위 변환으로 비교합니다 (엑셀 파싱 제외)."""
+    df = _synthetic_excel_frame(size)
+
+    def iterrows():
+        return [Work(index + 1, str(row['제목']), norm_author_key(str(row['저자'])), str(row['저자']),
+                     str(row['등록일'])) for index, row in df.iterrows()]
+
+    assert iterrows() == Repository._works_from_frame(df)
+    loop_time = _best_of(iterrows)
+    vector_time = _best_of(lambda: Repository._works_from_frame(df))
+    print(f"[BENCH] excel (도서 {size:,}행)")
+    print(f"  iterrows (기존): {loop_time * 1000:8.1f} ms")
+    print(f"  열 단위        : {vector_time * 1000:8.1f} ms")
+    print(f"  속도 향상      : {loop_time / vector_time:.1f}x")
+
+
+def _bench_copies(size: int):
+    """책개수 기반 복본 생성을 도서별 iloc 루프와 일괄 생성으로 비교합니다."""
+    df = _synthetic_excel_frame(size)
+    works = Repository._works_from_frame(df)
+
+    def iloc_loop(df):
+        copies, copy_id = [], 1
+        for work in works:
+            try:
+                copies_count = int(df.iloc[work.work_id - 1]['책개수'])
+            except Exception:
+                copies_count = 1
+            for _ in range(copies_count):
+                copies.append(Copy(copy_id, work.work_id, "available", work.registered_date))
+                copy_id += 1
+        return copies
+
+    # 책개수 열이 없는 카탈로그는 기존 루프처럼 도서마다 복본 1개
+    no_counts = df.drop(columns='책개수')
+    assert iloc_loop(no_counts) == Repository._copies_from_frame(no_counts, works)
+    assert iloc_loop(df) == Repository._copies_from_frame(df, works)
+    loop_time = _best_of(lambda: iloc_loop(df), repeat=1)
+    bulk_time = _best_of(lambda: Repository._copies_from_frame(df, works))
+    print(f"[BENCH] copies (도서 {size:,}행, 복본 {sum(Repository._copy_counts(df, works)):,}개)")
+    print(f"  iloc 루프 (기존): {loop_time * 1000:8.1f} ms")
+    print(f"  일괄 생성       : {bulk_time * 1000:8.1f} ms")
+    print(f"  속도 향상       : {loop_time / bulk_time:.1f}x")
+
+
+def _bench_catalog(size: int):
+    """같은 도서 목록을 엑셀, CSV, Parquet으로 저장해 데이터프레임으로 읽는 시간을 비교합니다 (엑셀 캐시 제외)."""
+    pd = _pandas()
+    df = _synthetic_excel_frame(size)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {ext: os.path.join(tmp, "catalog" + ext) for ext in (".xlsx", ".csv", ".parquet")}
+        df.to_excel(paths[".xlsx"], index=False)
+        df.to_csv(paths[".csv"], index=False)
+        try:
+            df.to_parquet(paths[".parquet"], index=False)
+        except ImportError:
+            del paths[".parquet"]  # pyarrow/fastparquet가 없으면 Parquet은 생략
+        times = {}
+        for ext, path in paths.items():
+            if ext == ".xlsx":
+                times[ext] = _best_of(lambda: pd.read_excel(path, engine='openpyxl'), repeat=1)
+            else:
+                times[ext] = _best_of(lambda: Repository._read_catalog_frame(path))
+            assert Repository._works_from_frame(Repository._read_catalog_frame(path)) == \
+                Repository._works_from_frame(df)
+        _check_importer_parity(tmp, list(paths))
+    print(f"[BENCH] catalog (도서 {size:,}행)")
+    for ext, t in times.items():
+        print(f"  {ext:<8}: {t * 1000:8.1f} ms ({times['.xlsx'] / t:.1f}x)")
+
+
+def _check_importer_parity(tmp: str, exts: List[str]):
+    """빈 행이나 책개수 열이 없는 카탈로그에서도 pandas와 스트리밍 경로의 도서·복본 수가 같은지 확인합니다."""
+    pd = _pandas()
+    blank = {c: None for c in EXCEL_COLUMNS}
+    rows = [{'제목': "A", '저자': "x", '등록일': "2025-01-01", '책개수': 2}, blank,
+            {'제목': "B", '저자': None, '등록일': "2025-01-01", '책개수': 3}, blank,
+            {'제목': "C", '저자': "y", '등록일': "2025-01-01", '책개수': None}]
+    with_counts = pd.DataFrame(rows, columns=list(EXCEL_COLUMNS))
+    for label, frame in (("blank", with_counts), ("nocount", with_counts.drop(columns='책개수'))):
+        for ext in exts:
+            path = os.path.join(tmp, f"parity_{label}{ext}")
+            if ext == ".xlsx":
+                frame.to_excel(path, index=False)
+            elif ext == ".csv":
+                frame.to_csv(path, index=False)
+            else:
+                frame.to_parquet(path, index=False)
+            df = Repository._read_catalog_frame(path)
+            works = Repository._works_from_frame(df)
+            assert (works, Repository._copy_counts(df, works)) == _catalog_from_rows(_iter_catalog_rows(path)), \
+                f"{label}{ext}: pandas와 스트리밍 경로의 결과가 다릅니다"
+
+
+BENCHMARKS = {
+    "startup": _bench_startup,
+    "write": _bench_write,
+    "service": _bench_service,
+    "list_works": _bench_list_works,
+    "list_loans": _bench_list_loans,
+    "loan": _bench_loan,
+    "register": _bench_register,
+    "excel": _bench_excel,
+    "copies": _bench_copies,
+    "catalog": _bench_catalog,
+}
+
+
+def run_benchmark(name: str, size: int):
+    """임시 디렉터리에서 벤치마크를 실행합니다. 실제 데이터 디렉터리는 건드리지 않습니다."""
+    names = list(BENCHMARKS) if name == "all" else [name]
+    for n in names:
+        BENCHMARKS[n](size)
+
 # -------------------- 입력 보조 --------------------
 
 def _input_date_safe(prompt: str, allow_past: bool = True) -> Optional[date]:
@@ -1108,31 +3369,112 @@ def _input_date_safe(prompt: str, allow_past: bool = True) -> Optional[date]:
 
 # -------------------- 진입점 --------------------
 
+def _open_storage(kind: str, args, data_dir: str) -> Storage:
+    """명령행 옵션에 맞는 저장 백엔드를 엽니다."""
+    if kind == "memory":
+        return MemoryStorage()
+    if kind == "sqlite":
+        return SqliteStorage(data_dir)
+    return JsonStorage(data_dir, snapshot=args.snapshot, json_format=args.json_format)
+
+
+def _open_repository(args, data_dir: str, default_storage: str = "json") -> Repository:
+    """명령행 옵션에 맞는 저장소를 엽니다."""
+    storage = _open_storage(args.storage or default_storage, args, data_dir)
+    return Repository(journal=args.journal, group_commit_ms=args.group_commit_ms,
+                      archive_days=args.archive_days, storage=storage, shared=args.shared,
+                      background=args.background_writer, excel_importer=args.excel_importer,
+                      catalog=args.catalog)
+
+
 def main(argv: Optional[List[str]] = None):
     parser = argparse.ArgumentParser(description="도서 대출 프로그램 (YES24 엑셀 데이터 기반)")
-    parser.add_argument("--mode", choices=["interactive", "selftest"], default="interactive")
+    parser.add_argument("--mode", choices=["interactive", "selftest", "bench", "import"], default="interactive")
+    parser.add_argument("files", nargs="*", help="--mode import에서 가져올 카탈로그 파일 (.xlsx, .xlsm, .csv, .parquet)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="--mode import에서 파일을 읽을 프로세스 수 (기본: CPU 코어 수)")
     parser.add_argument("--today", help="가상의 오늘 날짜(YYYY-MM-DD)")
     parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="데이터 디렉터리 (기본: ./data)")
+    parser.add_argument("--journal", action="store_true",
+                        help="저널 모드: 변경분만 로그에 덧붙이고 주기적으로 JSON에 체크포인트")
+    parser.add_argument("--storage", choices=["json", "sqlite", "memory"], default=None,
+                        help="저장 방식 (json: JSON 파일, sqlite: data-dir/library.db, memory: 저장하지 않음). "
+                             "기본: 대화식 모드는 json, 자가 테스트는 memory")
+    parser.add_argument("--shared", action="store_true",
+                        help="여러 프로세스(단말)가 같은 data-dir을 쓸 때 잠금과 버전 확인으로 변경 충돌을 방지 "
+                             "(POSIX 전용: fcntl 파일 잠금 사용)")
+    parser.add_argument("--group-commit-ms", type=int, default=GROUP_COMMIT_MS,
+                        help="그룹 커밋: 이 시간(ms) 안에 들어온 변경을 한 번의 기록(fsync)으로 합침. 각 작업은 "
+                             "자기 변경이 기록된 뒤에 완료되므로 중단되어도 완료된 작업은 남음 (기본: 0, 즉시 기록)")
+    parser.add_argument("--background-writer", action="store_true",
+                        help="저장을 별도 스레드에서 수행하여 작업마다 디스크 기록을 기다리지 않음. "
+                             "기록 전에 비정상 종료되면 그사이 완료된 작업이 유실될 수 있음")
+    parser.add_argument("--snapshot", action="store_true",
+                        help="JSON과 함께 바이너리 스냅샷(snapshot.bin)을 기록하고 시작 시 우선 로드")
+    parser.add_argument("--json-format", choices=JSON_FORMATS, default=None,
+                        help="JSON 저장 형식 (지정하면 데이터 디렉터리 설정으로 저장, 생략 시 기존 설정)")
+    parser.add_argument("--catalog", default=EXCEL_FILE,
+                        help=f"빈 데이터 디렉터리를 채울 도서 목록 (.xlsx, .csv, .parquet; 기본: {EXCEL_FILE})")
+    parser.add_argument("--excel-importer", choices=EXCEL_IMPORTERS, default=None,
+                        help="빈 데이터 디렉터리를 엑셀로 채우는 방식 (pandas: 데이터프레임, "
+                             "stream: openpyxl로 한 행씩; 기본: pandas가 있으면 pandas)")
+    parser.add_argument("--archive-days", type=int, default=None,
+                        help="반납 후 이 일수가 지난 대출을 archive/ 세그먼트로 옮겨 작업 집합에서 제외")
+    parser.add_argument("--timing", action="store_true",
+                        help="대화식 모드 시작 시간(임포트, 데이터 로드, 정합성 검사, 첫 메뉴)을 출력")
+    parser.add_argument("--bench", choices=["all", *BENCHMARKS], default="all",
+                        help="--mode bench에서 실행할 벤치마크")
+    parser.add_argument("--bench-size", type=int, default=100000,
+                        help="벤치마크 데이터 규모 (대출 건수 기준, 기본: 100000)")
     args = parser.parse_args(argv)
 
+    if args.shared and fcntl is None:
+        parser.error("--shared에는 파일 잠금(fcntl)이 필요하여 이 플랫폼(Windows 등)에서는 사용할 수 없습니다.")
+    if args.files and args.mode != "import":
+        parser.error("카탈로그 파일은 --mode import에서만 지정할 수 있습니다.")
+
+    if args.mode == "bench":
+        run_benchmark(args.bench, args.bench_size)
+        return
+
     # today 결정
     if args.today:
         today = parse_date(args.today)
     else:
         today = date.today()
 
-    # 저장소 준비
-    repo = Repository(data_dir=args.data_dir)
-
     if args.mode == "interactive":
-        CLI(repo, today).run()
-        
+        timing = StartupTiming(import_ms=_IMPORT_S * 1000) if args.timing else None
+        started = time.perf_counter()
+        repo = _open_repository(args, args.data_dir)
+        if timing is not None:
+            timing.load_ms = (time.perf_counter() - started) * 1000
+        try:
+            CLI(repo, today, timing).run()
+        finally:
+            # Ctrl+C 등으로 끝나도 기록 스레드가 쌓아 둔 변경을 기록
+            repo.close()
+
+    elif args.mode == "import":
+        if not args.files:
+            parser.error("--mode import에는 카탈로그 파일을 하나 이상 지정해야 합니다.")
+        repo = _open_repository(args, args.data_dir)
+        try:
+            LibraryService(repo, today).import_catalogs(args.files, args.workers)
+        finally:
+            repo.close()
+
     elif args.mode == "selftest":
-        # 테스트는 별도 데이터 디렉터리를 사용하여 기존 데이터에 영향 없게 수행
-        test_dir = os.path.join(args.data_dir, "_selftest")
-        ensure_data_dir(test_dir)
-        test_repo = Repository(data_dir=test_dir)
+        # 기본은 메모리 저장소로 파일을 쓰지 않음. 저장 방식을 지정하면 별도 데이터 디렉터리에서 수행
+        test_repo = _open_repository(args, os.path.join(args.data_dir, "_selftest"), "memory")
         run_selftest(test_repo, today)
+        test_repo.close()
+
+
+# --timing: 인터프리터 시작부터 모듈 임포트가 끝날 때까지. /proc가 없으면 이 모듈을 실행한 시간만 잼
+_IMPORT_S = _process_elapsed_s()
+if _IMPORT_S is None:
+    _IMPORT_S = time.perf_counter() - _MODULE_STARTED
 
 
 if __name__ == "__main__":